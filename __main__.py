@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Modules of this project import each other as top-level modules (``api``, ``services``...).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main  # noqa: E402
+
+sys.exit(main())
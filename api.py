@@ -6,9 +6,20 @@ This module contains classes that make http requests to SmartCAT
 `API Documentation <https://smartcat.ai/api/methods/>`_
 """
 
+import copy
 import json
+import time
+import bisect
+import random
+import threading
 import requests
 from abc import ABCMeta
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+
+#: Methods that can be repeated without changing the result on the server.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
 
 
 class SmartCAT(object):
@@ -47,17 +58,54 @@ class SmartCAT(object):
     SERVER_USA = "https://us.smartcat.ai"
     SERVER_EUROPE = "https://smartcat.ai"
 
-    def __init__(self, username, password, server_url=SERVER_EUROPE):
+    DEFAULT_POOL_SIZE = 10
+    DEFAULT_TIMEOUT = (10, 60)
+
+    def __init__(
+        self,
+        username,
+        password,
+        server_url=SERVER_EUROPE,
+        pool_size=DEFAULT_POOL_SIZE,
+        timeout=DEFAULT_TIMEOUT,
+        keep_alive=True,
+        retry_policy=None,
+        rate_limiter=None,
+        metrics=None,
+    ):
         """
         Constructor
 
         :param username: SmartCAT API username.
         :param password: SmartCAT API password.
         :param server_url (optional): The API server: SmartCAT.SERVER_EUROPE or SmartCAT.SERVER_USA
+        :param pool_size (optional): Maximum number of connections kept alive to the API server.
+        :param timeout (optional): Default per-request timeout in seconds,
+            either a single number or a ``(connect, read)`` tuple.
+        :param keep_alive (optional): Reuse connections between requests.
+        :param retry_policy (optional): :class:`RetryPolicy <RetryPolicy>` for transient failures,
+            ``RetryPolicy(max_retries=0)`` disables retries.
+        :param rate_limiter (optional): :class:`RateLimiter <RateLimiter>` throttling every request
+            made through this client; requests are not throttled without one.
+        :param metrics (optional): :class:`MetricsSink <MetricsSink>` receiving the timing of every request,
+            an :class:`InMemoryMetrics <InMemoryMetrics>` by default.
         """
         self.username = username
         self.password = password
         self.server_url = server_url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+
+        #: :class:`RetryPolicy <RetryPolicy>` shared by every resource.
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        #: :class:`RateLimiter <RateLimiter>` shared by every resource and every worker using this client.
+        self.rate_limiter = rate_limiter
+        #: :class:`MetricsSink <MetricsSink>` recording every request attempt.
+        self.metrics = metrics if metrics is not None else InMemoryMetrics()
+
+        #: Shared :class:`Session <requests.Session>` used by every resource.
+        self.session = self._create_session()
 
         #: :class:`Project <Project>`.
         self._project = None
@@ -90,49 +138,368 @@ class SmartCAT(object):
         self._document = self._create_api_resource("Document")
         return self._document
 
+    def close(self):
+        """Closes the shared session and all pooled connections."""
+        self.session.close()
+
+    def _create_session(self):
+        """Creates the pooled session shared by all API resources
+        :return: :class:`Session <requests.Session>` object
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        session.auth = (self.username, self.password)
+        session.headers.update({"Accept": "application/json"})
+        if not self.keep_alive:
+            session.headers.update({"Connection": "close"})
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def _create_api_resource(self, resource):
         """Creates and returns API resource
         :return: :class:`BaseResource <BaseResource>` object
         :rtype: smartcat.BaseResource
         """
-        return globals()[resource](self.username, self.password, self.server_url)
+        return globals()[resource](
+            self.session, self.server_url, self.timeout, self.retry_policy, self.rate_limiter, self.metrics
+        )
+
+
+class RetryPolicy(object):
+    """Retries of transient API failures
+
+    Requests failing with a connection error, a timeout or one of :attr:`RETRY_STATUSES`
+    are repeated with exponential backoff and jitter, or after the delay the server asks
+    for in ``Retry-After``, up to ``retry_after_max``. Non-idempotent requests are only repeated when the server
+    cannot have processed them: on :attr:`REJECTED_STATUSES` and connect timeouts.
+
+        >>> from smartcat.api import SmartCAT, RetryPolicy
+        >>> api = SmartCAT('username', 'password', retry_policy=RetryPolicy(max_retries=5))
+        >>> api.retry_policy.retry_counts()
+        {'document.get': 2, 'document.export': 1}
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    REJECTED_STATUSES = frozenset({429, 503})
+
+    def __init__(self, max_retries=3, backoff_base=0.5, backoff_max=30.0, jitter=0.5, retry_after_max=120.0):
+        """
+        Constructor
+
+        :param max_retries (optional): Retries per request after the first attempt.
+        :param backoff_base (optional): Delay before the first retry in seconds, doubled on every retry.
+        :param backoff_max (optional): Upper bound of the backoff delay in seconds.
+        :param jitter (optional): Random share of the delay, ``0`` for fixed delays.
+        :param retry_after_max (optional): Upper bound of a delay requested in ``Retry-After`` in seconds.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_after_max = retry_after_max
+        self._retries = {}
+        self._lock = threading.Lock()
+
+    def should_retry(self, attempt, idempotent, response=None, error=None):
+        """Returns True if attempt number ``attempt`` (0-based) should be repeated."""
+        if attempt >= self.max_retries:
+            return False
+        if error is not None:
+            if isinstance(error, requests.exceptions.ConnectTimeout):
+                return True
+            return idempotent and isinstance(
+                error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            )
+        if idempotent:
+            return response.status_code in self.RETRY_STATUSES
+        return response.status_code in self.REJECTED_STATUSES
+
+    def delay(self, attempt, response=None):
+        """Returns the seconds to wait before retrying attempt number ``attempt``."""
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.retry_after_max)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay * random.uniform(1 - self.jitter, 1)
+
+    def record_retry(self, endpoint):
+        with self._lock:
+            self._retries[endpoint] = self._retries.get(endpoint, 0) + 1
+
+    def retry_counts(self):
+        """Returns ``{endpoint: retries}`` since the client was created."""
+        with self._lock:
+            return dict(self._retries)
+
+    @staticmethod
+    def _retry_after(response):
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+
+class RateLimiter(object):
+    """Client-side token bucket throttling
+
+    Every request takes a token from a bucket refilled at ``rate`` tokens per second and
+    holding up to ``burst`` tokens. Endpoints listed in ``endpoint_rates`` additionally
+    draw from their own bucket. Low priority endpoints, such as status polls, leave
+    ``reserve`` of the shared bucket to uploads and downloads, so they back off first
+    when the client gets close to the limit.
+
+        >>> from smartcat.api import SmartCAT, RateLimiter
+        >>> limiter = RateLimiter(rate=10, burst=20, endpoint_rates={'document.get': 2})
+        >>> api = SmartCAT('username', 'password', rate_limiter=limiter)
+    """
+
+    LOW_PRIORITY_ENDPOINTS = frozenset({
+        "document.get",
+        "document.get_translation_status",
+        "project.segment_confirmation_statistics",
+    })
+
+    def __init__(self, rate=10.0, burst=20, endpoint_rates=None, low_priority=LOW_PRIORITY_ENDPOINTS, reserve=0.25):
+        """
+        Constructor
+
+        :param rate (optional): Requests per second across all endpoints.
+        :param burst (optional): Requests that can be sent at once after an idle period.
+        :param endpoint_rates (optional): ``{endpoint: requests per second}`` budgets of single endpoints.
+        :param low_priority (optional): Endpoints that yield to all others.
+        :param reserve (optional): Share of ``burst`` that low priority endpoints cannot use.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.endpoint_rates = dict(endpoint_rates or {})
+        self.low_priority = frozenset(low_priority)
+        self.reserve = reserve
+        now = time.monotonic()
+        self._buckets = {None: [float(burst), now]}
+        self._buckets.update({endpoint: [max(1.0, rate), now] for endpoint, rate in self.endpoint_rates.items()})
+        self._lock = threading.Lock()
+
+    def acquire(self, endpoint):
+        """Blocks until a request to ``endpoint`` may be sent."""
+        floor = 0.0
+        if endpoint in self.low_priority:
+            # Low priority requests need 1 + floor tokens, which a bucket of ``burst`` must be able to hold.
+            floor = min(self.burst * self.reserve, max(0.0, self.burst - 1.0))
+        while True:
+            with self._lock:
+                wait = self._take(endpoint, floor)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def _take(self, endpoint, floor):
+        """Takes a token from the shared and the endpoint bucket, or returns the seconds to wait."""
+        now = time.monotonic()
+        limits = [(None, self.rate, self.burst, floor)]
+        if endpoint in self.endpoint_rates:
+            rate = self.endpoint_rates[endpoint]
+            limits.append((endpoint, rate, max(1.0, rate), 0.0))
+
+        wait = 0.0
+        for key, rate, capacity, reserved in limits:
+            bucket = self._buckets[key]
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if bucket[0] < 1 + reserved:
+                wait = max(wait, (1 + reserved - bucket[0]) / rate)
+        if wait > 0:
+            return wait
+
+        for key, *_ in limits:
+            self._buckets[key][0] -= 1
+        return 0.0
+
+
+class MetricsSink(object):
+    """Receiver of request measurements
+
+    :class:`BaseResource <BaseResource>` calls :meth:`record_request` once per request attempt,
+    from whichever thread sent the request. Subclass it to forward measurements elsewhere.
+    """
+
+    def record_request(self, endpoint, method, status, latency, bytes_sent, bytes_received, attempt):
+        """Records one request attempt.
+
+        :param endpoint: Logical endpoint name, e.g. ``document.get``.
+        :param method: HTTP method.
+        :param status: HTTP status code, or the exception class name if no response was received.
+        :param latency: Seconds until the response headers arrived.
+        :param bytes_sent: Request body size, if known.
+        :param bytes_received: Response body size, if known.
+        :param attempt: ``0`` for the first attempt, ``n`` for the n-th retry.
+        """
+
+
+class InMemoryMetrics(MetricsSink):
+    """Aggregates request measurements per endpoint
+
+        >>> api = SmartCAT('username', 'password')
+        >>> api.metrics.snapshot()['document.get']['latency']['count']
+        42
+    """
+
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, endpoint, method, status, latency, bytes_sent, bytes_received, attempt):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    "requests": 0,
+                    "retries": 0,
+                    "statuses": {},
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                    "latency": {"count": 0, "sum": 0.0, "buckets": [0] * (len(self.LATENCY_BUCKETS) + 1)},
+                }
+            stats["requests"] += 1
+            stats["retries"] += 1 if attempt else 0
+            stats["statuses"][status] = stats["statuses"].get(status, 0) + 1
+            stats["bytes_sent"] += bytes_sent
+            stats["bytes_received"] += bytes_received
+            histogram = stats["latency"]
+            histogram["count"] += 1
+            histogram["sum"] += latency
+            histogram["buckets"][bisect.bisect_left(self.LATENCY_BUCKETS, latency)] += 1
+
+    def snapshot(self):
+        """Returns a copy of the per-endpoint aggregates.
+
+        ``latency.buckets[i]`` counts requests slower than ``LATENCY_BUCKETS[i - 1]`` seconds and at most
+        ``LATENCY_BUCKETS[i]`` seconds; the last bucket counts the slower ones.
+        """
+        with self._lock:
+            return copy.deepcopy(self._endpoints)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
 
 
 class BaseResource(object, metaclass=ABCMeta):
 
-    def __init__(self, username, password, server):
-        self.session = requests.Session()
-        self.session.auth = (username, password)
-        self.session.headers.update({"Accept": "application/json"})
+    def __init__(self, session, server, timeout=None, retry_policy=None, rate_limiter=None, metrics=None):
+        self.session = session
         self.server = server
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
 
-    def send_get_request(self, path, **kwargs):
+    def _request(self, method, path, endpoint=None, idempotent=None, **kwargs):
+        """Sends a request, retrying transient failures according to :attr:`retry_policy`.
+
+        Every attempt is throttled by :attr:`rate_limiter` and reported to :attr:`metrics`.
+
+        :param endpoint (optional): Logical endpoint name used for retry counters, e.g. ``document.get``.
+        :param idempotent (optional): Whether the request may be repeated; defaults by HTTP method.
+        """
         url = self.server + path
-        return self.session.get(url, **kwargs)
+        kwargs.setdefault("timeout", self.timeout)
+        endpoint = endpoint or method.lower()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+
+        policy = self.retry_policy
+        # Streams that cannot be rewound are sent only once.
+        bodies = self._body_positions(kwargs) if policy is not None else None
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self._record(endpoint, method, type(e).__name__, started, None, kwargs.get("stream"), attempt)
+                if bodies is None or not policy.should_retry(attempt, idempotent, error=e):
+                    raise
+                delay = policy.delay(attempt)
+            else:
+                self._record(endpoint, method, response.status_code, started, response, kwargs.get("stream"), attempt)
+                if bodies is None or not policy.should_retry(attempt, idempotent, response=response):
+                    return response
+                delay = policy.delay(attempt, response)
+                response.close()
+
+            policy.record_retry(endpoint)
+            time.sleep(delay)
+            for body, position in bodies:
+                body.seek(position)
+            attempt += 1
+
+    def _record(self, endpoint, method, status, started, response, stream, attempt):
+        if self.metrics is None:
+            return
+        latency = time.monotonic() - started
+        bytes_sent = bytes_received = 0
+        if response is not None:
+            bytes_sent = int(response.request.headers.get("Content-Length") or 0)
+            if stream:
+                # The body of a streamed response has not been read yet.
+                bytes_received = int(response.headers.get("Content-Length") or 0)
+            else:
+                bytes_received = len(response.content)
+        self.metrics.record_request(endpoint, method, status, latency, bytes_sent, bytes_received, attempt)
+
+    @staticmethod
+    def _body_positions(kwargs):
+        """Returns ``[(file, position)]`` for the file-like parts of a request body,
+        or ``None`` if one of them cannot be rewound for a retry."""
+        parts = [kwargs.get("data")]
+        files = kwargs.get("files") or {}
+        for value in (files.values() if isinstance(files, dict) else (value for _, value in files)):
+            # ``('filename', fileobj, ...)`` tuples carry the file second.
+            parts.append(value[1] if isinstance(value, (tuple, list)) else value)
+
+        positions = []
+        for part in parts:
+            if part is None or isinstance(part, (str, bytes, bytearray, dict, list, tuple)):
+                continue
+            if not (hasattr(part, "seek") and hasattr(part, "tell")):
+                return None
+            positions.append((part, part.tell()))
+        return positions
+
+    def send_get_request(self, path, **kwargs):
+        return self._request("GET", path, **kwargs)
 
     def send_options_request(self, path, **kwargs):
-        url = self.server + path
-        return self.session.options(url, **kwargs)
+        return self._request("OPTIONS", path, **kwargs)
 
     def send_head_request(self, path, **kwargs):
-        url = self.server + path
-        return self.session.put(url, **kwargs)
+        return self._request("HEAD", path, **kwargs)
 
     def send_post_request(self, path, data=None, json=None, **kwargs):
-        url = self.server + path
-        return self.session.post(url, data=data, json=json, **kwargs)
+        return self._request("POST", path, data=data, json=json, **kwargs)
 
     def send_put_request(self, path, data=None, **kwargs):
-        url = self.server + path
-        return self.session.put(url, data=data, **kwargs)
+        return self._request("PUT", path, data=data, **kwargs)
 
     def send_patch_request(self, path, data=None, **kwargs):
-        url = self.server + path
-        return self.session.patch(url, data=data, **kwargs)
+        return self._request("PATCH", path, data=data, **kwargs)
 
     def send_delete_request(self, path, **kwargs):
-        url = self.server + path
-        return self.session.delete(url, **kwargs)
+        return self._request("DELETE", path, **kwargs)
 
 
 class Project(BaseResource):
@@ -155,7 +522,7 @@ class Project(BaseResource):
 
         files["model"] = (None, json.dumps(data), "application/json")
 
-        return self.send_post_request("/api/integration/v1/project/create", files=files)
+        return self.send_post_request("/api/integration/v1/project/create", files=files, endpoint="project.create")
 
     def update(self, id, data):
         """Update project by id
@@ -166,7 +533,7 @@ class Project(BaseResource):
         :return: :class:`Response <Response>` object
         :rtype: requests.Response
         """
-        return self.send_put_request(f"/api/integration/v1/project/{id}", json=data)
+        return self.send_put_request(f"/api/integration/v1/project/{id}", json=data, endpoint="project.update")
 
     def delete(self, id):
         """Delete project
@@ -175,7 +542,7 @@ class Project(BaseResource):
         :return: :class:`Response <Response>` object
         :rtype: requests.Response
         """
-        return self.send_delete_request(f"/api/integration/v1/project/{id}")
+        return self.send_delete_request(f"/api/integration/v1/project/{id}", endpoint="project.delete")
 
     def cancel(self, id):
         """Cancel the project
@@ -186,7 +553,7 @@ class Project(BaseResource):
         """
 
         return self.send_post_request(
-            "/api/integration/v1/project/cancel", params={"projectId": id}
+            "/api/integration/v1/project/cancel", params={"projectId": id}, endpoint="project.cancel"
         )
 
     def restore(self, id):
@@ -198,7 +565,7 @@ class Project(BaseResource):
         """
 
         return self.send_post_request(
-            "/api/integration/v1/project/restore", params={"projectId": id}
+            "/api/integration/v1/project/restore", params={"projectId": id}, endpoint="project.restore"
         )
 
     def get(self, id):
@@ -208,7 +575,7 @@ class Project(BaseResource):
         :return: :class:`Response <Response>` object
         :rtype: requests.Response
         """
-        return self.send_get_request(f"/api/integration/v1/project/{id}")
+        return self.send_get_request(f"/api/integration/v1/project/{id}", endpoint="project.get")
 
     def completed_work_statistics(self, id):
         """Receiving statistics for the completed parts of the project.
@@ -218,7 +585,8 @@ class Project(BaseResource):
         :rtype: requests.Response
         """
         return self.send_get_request(
-            f"/api/integration/v1/project/{id}/completedWorkStatistics"
+            f"/api/integration/v1/project/{id}/completedWorkStatistics",
+            endpoint="project.completed_work_statistics",
         )
 
     def segment_confirmation_statistics(self, id, document=''):
@@ -230,7 +598,8 @@ class Project(BaseResource):
         :rtype: requests.Response
         """
         return self.send_get_request(
-            f"/api/integration/v1/segment-confirmation-statistics/{id}?documentId={document}"
+            f"/api/integration/v1/segment-confirmation-statistics/{id}?documentId={document}",
+            endpoint="project.segment_confirmation_statistics",
         )
 
     def get_all(self):
@@ -239,9 +608,9 @@ class Project(BaseResource):
         :return: :class:`Response <Response>` object
         :rtype: requests.Response
         """
-        return self.send_get_request("/api/integration/v2/project/list")
+        return self.send_get_request("/api/integration/v2/project/list", endpoint="project.get_all")
 
-    def attach_document(self, id, files):
+    def attach_document(self, id, files=None, **kwargs):
         """Adds document to project.
 
         :param id: The project identifier.
@@ -251,12 +620,18 @@ class Project(BaseResource):
             or a 4-tuple ``('filename', fileobj, 'content_type', custom_headers)``, where ``'content-type'`` is a string
             defining the content type of the given file and ``custom_headers`` a dict-like object containing additional
             headers to add for the file
+        :param kwargs: (optional) Extra request arguments, e.g. a pre-encoded streaming ``data`` body
+            with its ``headers``.
         :return: :class:`Response <Response>` object
         :rtype: requests.Response
         """
         params = {"projectId": id}
         return self.send_post_request(
-            "/api/integration/v1/project/document", files=files, params=params
+            "/api/integration/v1/project/document",
+            files=files,
+            params=params,
+            endpoint="project.attach_document",
+            **kwargs,
         )
 
     def add_target_lang(self, id, lang):
@@ -271,6 +646,7 @@ class Project(BaseResource):
         return self.send_post_request(
             "/api/integration/v1/project/language",
             params={"projectId": id, "targetLanguage": lang},
+            endpoint="project.add_target_lang",
         )
 
 
@@ -283,7 +659,7 @@ class Document(BaseResource):
         :rtype: requests.Response
         """
         return self.send_get_request(
-            "/api/integration/v1/document", params={"documentId": id}
+            "/api/integration/v1/document", params={"documentId": id}, endpoint="document.get"
         )
 
     def delete(self, id):
@@ -294,7 +670,7 @@ class Document(BaseResource):
         :rtype: requests.Response
         """
         return self.send_delete_request(
-            "/api/integration/v1/document", params={"documentIds": id}
+            "/api/integration/v1/document", params={"documentIds": id}, endpoint="document.delete"
         )
 
     def update(self, document_id, files):
@@ -316,6 +692,7 @@ class Document(BaseResource):
             "/api/integration/v1/document/update",
             files=files,
             params={"documentId": document_id},
+            endpoint="document.update",
         )
 
     def rename(self, id, name):
@@ -330,6 +707,7 @@ class Document(BaseResource):
         return self.send_put_request(
             "/api/integration/v1/document/rename",
             params={"documentId": id, "name": name},
+            endpoint="document.rename",
         )
 
     def get_translation_status(self, id):
@@ -339,7 +717,9 @@ class Document(BaseResource):
         :rtype: requests.Response
         """
         return self.send_get_request(
-            "/api/integration/v1/document/translate/status", params={"documentId": id}
+            "/api/integration/v1/document/translate/status",
+            params={"documentId": id},
+            endpoint="document.get_translation_status",
         )
 
     def translate(self, id, files):
@@ -365,6 +745,7 @@ class Document(BaseResource):
             "/api/integration/v1/document/translate",
             files=files,
             params={"documentId": id},
+            endpoint="document.translate",
         )
 
     def request_export(self, document_ids, target_type="target"):
@@ -381,7 +762,11 @@ class Document(BaseResource):
         params = {"documentIds": "\n".join(document_ids), "type": target_type}
 
         return self.send_post_request(
-            "/api/integration/v1/document/export", params=params
+            "/api/integration/v1/document/export",
+            params=params,
+            endpoint="document.export",
+            # A repeated export only creates another task for the same documents.
+            idempotent=True,
         )
 
     def download_export_result(self, task_id):
@@ -390,5 +775,5 @@ class Document(BaseResource):
         :param task_id: The export task identifier
         """
         return self.send_get_request(
-            f"/api/integration/v1/document/export/{task_id}", stream=True
+            f"/api/integration/v1/document/export/{task_id}", stream=True, endpoint="document.download"
         )
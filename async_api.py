@@ -0,0 +1,411 @@
+"""
+smartcat.async_api
+~~~~~~~~~~~~~~~~~~
+
+Asyncio counterpart of :mod:`smartcat.api`. The classes expose the same
+resources and method names, but every call is a coroutine running on a
+shared :class:`httpx.AsyncClient`, so one event loop can keep many uploads,
+status polls and downloads in flight at once.
+`API Documentation <https://smartcat.ai/api/methods/>`_
+"""
+
+import json
+import httpx
+from abc import ABCMeta
+
+
+class AsyncSmartCAT(object):
+    """Asyncio SmartCAT API
+
+    Provides functionality for SmartCAT resource management:
+        - project
+        - document
+    Manage Document Resource::
+
+        >>> from smartcat.async_api import AsyncSmartCAT
+        >>> async with AsyncSmartCAT('username', 'password', AsyncSmartCAT.SERVER_EUROPE) as api:
+        ...     responses = await asyncio.gather(*(api.document.get(doc_id) for doc_id in doc_ids))
+        [<Response [200 OK]>, ...]
+    """
+
+    SERVER_USA = "https://us.smartcat.ai"
+    SERVER_EUROPE = "https://smartcat.ai"
+
+    DEFAULT_POOL_SIZE = 100
+    DEFAULT_TIMEOUT = (10, 60)
+
+    def __init__(
+        self,
+        username,
+        password,
+        server_url=SERVER_EUROPE,
+        pool_size=DEFAULT_POOL_SIZE,
+        timeout=DEFAULT_TIMEOUT,
+        keep_alive=True,
+    ):
+        """
+        Constructor
+
+        :param username: SmartCAT API username.
+        :param password: SmartCAT API password.
+        :param server_url (optional): The API server: AsyncSmartCAT.SERVER_EUROPE or AsyncSmartCAT.SERVER_USA
+        :param pool_size (optional): Maximum number of concurrent connections to the API server.
+        :param timeout (optional): Default per-request timeout in seconds,
+            either a single number or a ``(connect, read)`` tuple.
+        :param keep_alive (optional): Reuse connections between requests.
+        """
+        self.username = username
+        self.password = password
+        self.server_url = server_url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+
+        #: Shared :class:`AsyncClient <httpx.AsyncClient>` used by every resource.
+        self.client = self._create_client()
+
+        self._project = None
+        self._document = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def project(self):
+        """Returns instance of class:`AsyncProject <smartcat.async_api.AsyncProject>`.
+
+        :return: :class:`AsyncProject <smartcat.async_api.AsyncProject>` object
+        :rtype: smartcat.async_api.AsyncProject
+        """
+        if self._project is not None:
+            return self._project
+
+        self._project = self._create_api_resource("AsyncProject")
+
+        return self._project
+
+    @property
+    def document(self):
+        """Returns instance of `AsyncDocument <smartcat.async_api.AsyncDocument>`
+
+        :return: :class:`AsyncDocument <smartcat.async_api.AsyncDocument>` object
+        :rtype: smartcat.async_api.AsyncDocument
+        """
+        if self._document is not None:
+            return self._document
+
+        self._document = self._create_api_resource("AsyncDocument")
+        return self._document
+
+    async def close(self):
+        """Closes the shared client and all pooled connections."""
+        await self.client.aclose()
+
+    def _create_client(self):
+        """Creates the pooled client shared by all API resources
+        :return: :class:`AsyncClient <httpx.AsyncClient>` object
+        :rtype: httpx.AsyncClient
+        """
+        if isinstance(self.timeout, tuple):
+            connect, read = self.timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        else:
+            timeout = httpx.Timeout(self.timeout)
+
+        limits = httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size if self.keep_alive else 0,
+        )
+        return httpx.AsyncClient(
+            auth=(self.username, self.password),
+            headers={"Accept": "application/json"},
+            timeout=timeout,
+            limits=limits,
+        )
+
+    def _create_api_resource(self, resource):
+        """Creates and returns API resource
+        :return: :class:`AsyncBaseResource <AsyncBaseResource>` object
+        :rtype: smartcat.AsyncBaseResource
+        """
+        return globals()[resource](self.client, self.server_url)
+
+
+class AsyncBaseResource(object, metaclass=ABCMeta):
+
+    def __init__(self, client, server):
+        self.client = client
+        self.server = server
+
+    async def _request(self, method, path, stream=False, **kwargs):
+        url = self.server + path
+        if not stream:
+            return await self.client.request(method, url, **kwargs)
+
+        # Streamed responses must be released by the caller with ``await response.aclose()``.
+        request = self.client.build_request(method, url, **kwargs)
+        return await self.client.send(request, stream=True)
+
+    async def send_get_request(self, path, **kwargs):
+        return await self._request("GET", path, **kwargs)
+
+    async def send_options_request(self, path, **kwargs):
+        return await self._request("OPTIONS", path, **kwargs)
+
+    async def send_head_request(self, path, **kwargs):
+        return await self._request("HEAD", path, **kwargs)
+
+    async def send_post_request(self, path, data=None, json=None, **kwargs):
+        return await self._request("POST", path, data=data, json=json, **kwargs)
+
+    async def send_put_request(self, path, data=None, **kwargs):
+        return await self._request("PUT", path, data=data, **kwargs)
+
+    async def send_patch_request(self, path, data=None, **kwargs):
+        return await self._request("PATCH", path, data=data, **kwargs)
+
+    async def send_delete_request(self, path, **kwargs):
+        return await self._request("DELETE", path, **kwargs)
+
+
+class AsyncProject(AsyncBaseResource):
+
+    async def create(self, data, files=None):
+        """Create a new project
+
+        :param data: The project information.
+        :type data: dict
+        :param files: (optional) Dictionary of ``'name': file-like-objects`` (or ``{'name': file-tuple}``)
+         for multipart encoding upload. See :meth:`smartcat.api.Project.create`.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+
+        if files is None:
+            files = {}
+
+        files["model"] = (None, json.dumps(data), "application/json")
+
+        return await self.send_post_request("/api/integration/v1/project/create", files=files)
+
+    async def update(self, id, data):
+        """Update project by id
+
+        :param id: The project identifier.
+        :param data: The project information.
+        :type data: dict
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_put_request(f"/api/integration/v1/project/{id}", json=data)
+
+    async def delete(self, id):
+        """Delete project
+
+        :param id: The project identifier.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_delete_request(f"/api/integration/v1/project/{id}")
+
+    async def cancel(self, id):
+        """Cancel the project
+
+        :param id: The project identifier.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_post_request(
+            "/api/integration/v1/project/cancel", params={"projectId": id}
+        )
+
+    async def restore(self, id):
+        """Restore the project
+
+        :param id: The project identifier.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_post_request(
+            "/api/integration/v1/project/restore", params={"projectId": id}
+        )
+
+    async def get(self, id):
+        """Get project
+
+        :param id: The project identifier.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_get_request(f"/api/integration/v1/project/{id}")
+
+    async def completed_work_statistics(self, id):
+        """Receiving statistics for the completed parts of the project.
+
+        :param id: The project identifier.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_get_request(
+            f"/api/integration/v1/project/{id}/completedWorkStatistics"
+        )
+
+    async def segment_confirmation_statistics(self, id, document=''):
+        """Receiving statistics for the completed parts of the project.
+
+        :param id: The project identifier.
+        :param document: The document identifier.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_get_request(
+            f"/api/integration/v1/segment-confirmation-statistics/{id}?documentId={document}"
+        )
+
+    async def get_all(self):
+        """Returns the list of projects.
+
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_get_request("/api/integration/v2/project/list")
+
+    async def attach_document(self, id, files=None, **kwargs):
+        """Adds document to project.
+
+        :param id: The project identifier.
+        :param files: (optional) Dictionary of ``'name': file-like-objects`` (or ``{'name': file-tuple}``)
+         for multipart encoding upload. See :meth:`smartcat.api.Project.attach_document`.
+        :param kwargs: (optional) Extra request arguments, e.g. a pre-encoded streaming ``content`` body
+            with its ``headers``.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        params = {"projectId": id}
+        return await self.send_post_request(
+            "/api/integration/v1/project/document", files=files, params=params, **kwargs
+        )
+
+    async def add_target_lang(self, id, lang):
+        """Add a new target language to the project
+
+        :param id: The project identifier.
+        :param lang: Target language code.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_post_request(
+            "/api/integration/v1/project/language",
+            params={"projectId": id, "targetLanguage": lang},
+        )
+
+
+class AsyncDocument(AsyncBaseResource):
+    async def get(self, id):
+        """Get document
+
+        :param id: The document identifier.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_get_request(
+            "/api/integration/v1/document", params={"documentId": id}
+        )
+
+    async def delete(self, id):
+        """Delete document
+
+        :param id: The document identifier.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_delete_request(
+            "/api/integration/v1/document", params={"documentIds": id}
+        )
+
+    async def update(self, document_id, files):
+        """Updates document
+
+        :param document_id: The document identifier.
+        :param files: Dictionary of ``'name': file-like-objects`` (or ``{'name': file-tuple}``)
+         for multipart encoding upload. See :meth:`smartcat.api.Document.update`.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_put_request(
+            "/api/integration/v1/document/update",
+            files=files,
+            params={"documentId": document_id},
+        )
+
+    async def rename(self, id, name):
+        """Renames document
+
+        :param id: The document identifier.
+        :param name: New name.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_put_request(
+            "/api/integration/v1/document/rename",
+            params={"documentId": id, "name": name},
+        )
+
+    async def get_translation_status(self, id):
+        """Receive the status of adding document translation.
+
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_get_request(
+            "/api/integration/v1/document/translate/status", params={"documentId": id}
+        )
+
+    async def translate(self, id, files):
+        """Translate the selected document using the uploaded translation file.
+
+        :param id: The document identifier.
+        :param files: Dictionary of ``'name': file-like-objects`` (or ``{'name': file-tuple}``)
+         for multipart encoding upload. See :meth:`smartcat.api.Document.translate`.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_put_request(
+            "/api/integration/v1/document/translate",
+            files=files,
+            params={"documentId": id},
+        )
+
+    async def request_export(self, document_ids, target_type="target"):
+        """Sends task to export transations
+
+        :param document_ids: The document identifier string or list of the identifier.
+        :param target_type (optional): The translation document type: xliff or target.
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        if isinstance(document_ids, str):
+            document_ids = [document_ids]
+
+        params = {"documentIds": "\n".join(document_ids), "type": target_type}
+
+        return await self.send_post_request(
+            "/api/integration/v1/document/export", params=params
+        )
+
+    async def download_export_result(self, task_id):
+        """Download the results of export
+
+        The response is streamed: read it with ``response.aiter_bytes()`` and
+        release it with ``await response.aclose()``.
+
+        :param task_id: The export task identifier
+        :return: :class:`Response <Response>` object
+        :rtype: httpx.Response
+        """
+        return await self.send_get_request(
+            f"/api/integration/v1/document/export/{task_id}", stream=True
+        )
@@ -0,0 +1,317 @@
+"""
+smartcat.cli
+~~~~~~~~~~~~
+
+Headless batch translation for servers and cron jobs. It runs the same file pipeline as the GUI,
+configured from the same ``.env`` file, without PyQt::
+
+    python -m smartcat translate ./docs --out ./translated -j 16
+    python -m smartcat translate-text < strings.txt > strings.translated.txt
+
+Exit codes:
+    0 - every file was translated
+    1 - some files or lines failed
+    2 - invalid arguments or configuration
+    3 - the job could not run, e.g. the project is not reachable
+    130 - interrupted
+"""
+
+import os
+import sys
+import argparse
+import threading
+from datetime import datetime
+from pathlib import Path
+from config import load_env_config
+from services.document_service import DocumentService
+from services.file_cache import FileCache
+from services.file_pipeline import FilePipeline
+from services.job_journal import JobJournal
+from services.polling import PollScheduler
+from services.runtime import create_api_client, start_metrics_exporters
+from services.text_batcher import TextBatcher
+from services.trace import TraceWriter
+
+EXIT_OK = 0
+EXIT_FILES_FAILED = 1
+EXIT_USAGE = 2
+EXIT_ERROR = 3
+EXIT_INTERRUPTED = 130
+
+_print_lock = threading.Lock()
+
+
+def log(message, stream=sys.stdout):
+    """Prints a timestamped single-line message; safe to call from pipeline threads."""
+    line = " ".join(str(message).split())
+    with _print_lock:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] {line}", file=stream, flush=True)
+
+
+def collect_files(inputs, pattern="*", recursive=False):
+    """Expands files and directories into a sorted list of source files.
+
+    Hidden files and earlier ``_translated`` outputs are skipped.
+    """
+    paths = []
+    for item in inputs:
+        if os.path.isfile(item):
+            paths.append(os.path.abspath(item))
+            continue
+        if not os.path.isdir(item):
+            raise FileNotFoundError(f"No such file or directory: {item}")
+        matches = Path(item).rglob(pattern) if recursive else Path(item).glob(pattern)
+        for path in sorted(matches):
+            if path.is_file() and not path.name.startswith(".") and not path.stem.endswith("_translated"):
+                paths.append(str(path.resolve()))
+    return list(dict.fromkeys(paths))
+
+
+def output_collisions(file_paths, output_folder):
+    """Returns ``{output path: [source paths]}`` for sources whose translations would overwrite each other."""
+    outputs = {}
+    for path in file_paths:
+        output = DocumentService.translated_path(path, output_folder)
+        outputs.setdefault(os.path.normcase(output), []).append(path)
+    return {output: paths for output, paths in outputs.items() if len(paths) > 1}
+
+
+def build_parser(config):
+    parser = argparse.ArgumentParser(prog="smartcat", description="SmartCAT batch translation")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    translate = commands.add_parser("translate", help="Translate files and directories")
+    translate.add_argument("inputs", nargs="+", help="Files or directories to translate")
+    translate.add_argument(
+        "-o", "--out", help="Output directory for all translations (default: next to each source file)",
+    )
+    translate.add_argument(
+        "-j", "--jobs", type=int, default=config["files_upload_concurrency"],
+        help="Concurrent uploads and exports (default: %(default)s)",
+    )
+    translate.add_argument("-r", "--recursive", action="store_true", help="Descend into subdirectories")
+    translate.add_argument("--pattern", default="*", help="Glob for files inside directories (default: %(default)s)")
+    translate.add_argument(
+        "--batch-size", type=int, default=config["files_export_batch_size"],
+        help="Documents per export task (default: %(default)s)",
+    )
+    translate.add_argument(
+        "--no-pipeline", action="store_true",
+        help="Wait for all pretranslations before exporting instead of exporting each file when ready",
+    )
+    translate.add_argument("--no-cache", action="store_true", help="Do not use the local file cache")
+    translate.add_argument("--trace", default=config["trace_file"] or None, help="Append stage traces to this file")
+    translate.add_argument(
+        "--metrics-port", type=int, default=config["metrics_port"], help="Serve Prometheus metrics on this port",
+    )
+    translate.add_argument(
+        "--metrics-textfile", default=config["metrics_textfile"] or None,
+        help="Write Prometheus metrics to this file for the node_exporter textfile collector",
+    )
+    translate.add_argument("-q", "--quiet", action="store_true", help="Only print per-file results")
+
+    translate_text = commands.add_parser(
+        "translate-text", help="Translate each line of text files or stdin, printing one translation per line",
+    )
+    translate_text.add_argument("inputs", nargs="*", default=["-"], help="Text files, or - for stdin (default)")
+    translate_text.add_argument(
+        "-j", "--jobs", type=int, default=config["text_chunk_concurrency"],
+        help="Batch documents translated at once (default: %(default)s)",
+    )
+    translate_text.add_argument(
+        "--batch-size", type=int, default=config["text_batch_max_size"],
+        help="Lines per batch document (default: %(default)s)",
+    )
+    translate_text.add_argument("-q", "--quiet", action="store_true", help="Do not print progress")
+    return parser
+
+
+def read_lines(inputs):
+    """Returns the lines of the given text files, reading stdin for ``-``."""
+    lines = []
+    for item in inputs:
+        if item == "-":
+            lines.extend(sys.stdin.read().splitlines())
+            continue
+        with open(item, encoding="utf-8") as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+def translate(args, config):
+    if not (config["username"] and config["password"] and config["project_id"]):
+        log("SMARTCAT_USERNAME, SMARTCAT_PASSWORD and SMARTCAT_PROJECT_ID must be set", sys.stderr)
+        return EXIT_USAGE
+    try:
+        file_paths = collect_files(args.inputs, args.pattern, args.recursive)
+    except FileNotFoundError as e:
+        log(str(e), sys.stderr)
+        return EXIT_USAGE
+    if not file_paths:
+        log("No files to translate")
+        return EXIT_OK
+    if args.out:
+        # --out is a single flat directory, so sources with the same name from different folders would collide.
+        collisions = output_collisions(file_paths, args.out)
+        for output, paths in collisions.items():
+            log(f"{len(paths)} files would be written to {output}: {', '.join(paths)}", sys.stderr)
+        if collisions:
+            log("Translate them in separate runs, or without --out to write next to each source", sys.stderr)
+            return EXIT_USAGE
+        os.makedirs(args.out, exist_ok=True)
+
+    progress_fn = (lambda message: None) if args.quiet else (lambda message: log(message, sys.stderr))
+    jobs = max(1, args.jobs)
+    # The client sizes its connection pool from these, so every worker thread keeps its own connection.
+    config = dict(
+        config,
+        files_upload_concurrency=jobs,
+        files_export_concurrency=jobs,
+        status_poll_concurrency=max(jobs, config["status_poll_concurrency"]),
+        text_chunk_concurrency=0,
+        metrics_port=args.metrics_port,
+        metrics_textfile=args.metrics_textfile or "",
+    )
+    try:
+        exporters = start_metrics_exporters(config)
+    except OSError as e:
+        log(f"Cannot start metrics exporter: {str(e)}", sys.stderr)
+        return EXIT_ERROR
+    api_client = create_api_client(config)
+    try:
+        response = api_client.project.get(config["project_id"])
+        if response.status_code != 200:
+            log(f"Cannot access project {config['project_id']}: {response.status_code}", sys.stderr)
+            return EXIT_ERROR
+
+        file_cache = None
+        if config["file_cache_enabled"] and not args.no_cache:
+            file_cache = FileCache(os.path.join(config["cache_dir"], "files"), config["file_cache_max_mb"] * 1024 * 1024)
+        journal = None
+        if config["job_journal_enabled"]:
+            journal = JobJournal(os.path.join(config["cache_dir"], "jobs.sqlite3"))
+
+        pipeline = FilePipeline(
+            api_client,
+            file_paths,
+            config["project_id"],
+            args.out,
+            config["files_max_retries"],
+            config["files_retry_delay"],
+            upload_concurrency=jobs,
+            pipelined=not args.no_pipeline,
+            export_concurrency=jobs,
+            export_batch_size=max(1, args.batch_size),
+            upload_chunk_size=config["upload_chunk_size"],
+            upload_use_mmap=config["upload_use_mmap"],
+            poll_scheduler=PollScheduler(
+                config["poll_initial_delay"], config["poll_max_delay"], config["poll_backoff"], config["poll_jitter"],
+            ),
+            status_poll_concurrency=config["status_poll_concurrency"],
+            source_lang=config["source_lang"],
+            target_lang=config["target_lang"],
+            file_cache=file_cache,
+            journal=journal,
+            delete_batch_size=config["files_delete_batch_size"],
+            delete_retries=config["files_delete_retries"],
+            trace_writer=TraceWriter(args.trace) if args.trace else None,
+            progress_fn=progress_fn,
+            file_fn=lambda file_name, status: log(f"{file_name}: {status}"),
+        )
+        log(f"Translating {len(file_paths)} files ({jobs} at a time)...")
+        log(pipeline.run())
+    except KeyboardInterrupt:
+        log("Interrupted; run the same command again to resume", sys.stderr)
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        log(f"Error: {str(e)}", sys.stderr)
+        return EXIT_ERROR
+    finally:
+        api_client.close()
+        for exporter in exporters:
+            exporter.stop()
+
+    for path, error in pipeline.failed:
+        log(f"FAILED {path}: {error}", sys.stderr)
+    return EXIT_FILES_FAILED if pipeline.failed else EXIT_OK
+
+
+def translate_text(args, config):
+    if not (config["username"] and config["password"] and config["project_id"]):
+        log("SMARTCAT_USERNAME, SMARTCAT_PASSWORD and SMARTCAT_PROJECT_ID must be set", sys.stderr)
+        return EXIT_USAGE
+    try:
+        lines = read_lines(args.inputs)
+    except OSError as e:
+        log(str(e), sys.stderr)
+        return EXIT_USAGE
+    texts = [line for line in lines if line.strip()]
+    if not texts:
+        return EXIT_OK
+
+    progress_fn = (lambda message: None) if args.quiet else (lambda message: log(message, sys.stderr))
+    jobs = max(1, args.jobs)
+    batch_size = max(1, args.batch_size)
+    config = dict(config, text_chunk_concurrency=jobs)
+    api_client = create_api_client(config)
+    translations, failed = {}, []
+    try:
+        service = DocumentService(
+            api_client,
+            config["project_id"],
+            config["max_retries"],
+            config["retry_delay"],
+            poll_scheduler=PollScheduler(
+                config["poll_initial_delay"], config["poll_max_delay"], config["poll_backoff"], config["poll_jitter"],
+            ),
+            source_lang=config["source_lang"],
+            target_lang=config["target_lang"],
+        )
+        batcher = TextBatcher(service, max_batch_size=batch_size, log_fn=progress_fn)
+        log(f"Translating {len(texts)} lines in documents of {batch_size} ({jobs} at a time)...", sys.stderr)
+        # Full batches are translated in the batcher's threads and the remainder by flush(),
+        # so each round keeps at most ``jobs`` documents in flight.
+        round_size = jobs * batch_size
+        for start in range(0, len(texts), round_size):
+            futures = [batcher.submit(text) for text in texts[start:start + round_size]]
+            batcher.flush()
+            for index, future in enumerate(futures, start):
+                try:
+                    translations[index] = future.result()
+                except Exception as e:
+                    failed.append((index, str(e)))
+    except KeyboardInterrupt:
+        log("Interrupted", sys.stderr)
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        log(f"Error: {str(e)}", sys.stderr)
+        return EXIT_ERROR
+    finally:
+        api_client.close()
+
+    # Blank and failed lines stay empty, so the output lines up with the input.
+    translated = iter(translations.get(index, "") for index in range(len(texts)))
+    for line in lines:
+        print(next(translated) if line.strip() else "")
+    sys.stdout.flush()
+    for index, error in failed:
+        log(f"FAILED {texts[index]}: {error}", sys.stderr)
+    return EXIT_FILES_FAILED if failed else EXIT_OK
+
+
+def main(argv=None):
+    try:
+        config = load_env_config()
+    except ValueError as e:
+        log(f"Invalid configuration: {str(e)}", sys.stderr)
+        return EXIT_USAGE
+    args = build_parser(config).parse_args(argv)
+    if args.command == "translate":
+        return translate(args, config)
+    if args.command == "translate-text":
+        return translate_text(args, config)
+    return EXIT_USAGE
+
+
+if __name__ == "__main__":
+    sys.exit(main())
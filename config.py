@@ -16,4 +16,45 @@ def load_env_config():
         "retry_delay": int(os.getenv("RETRY_DELAY", "5")),
         "files_max_retries": int(os.getenv("FILES_MAX_RETRIES", "5")),
         "files_retry_delay": int(os.getenv("FILES_RETRY_DELAY", "60")),
+        "files_upload_concurrency": int(os.getenv("FILES_UPLOAD_CONCURRENCY", "4")),
+        "files_pipelined": os.getenv("FILES_PIPELINED", "true").lower() in ("1", "true", "yes"),
+        "files_export_concurrency": int(os.getenv("FILES_EXPORT_CONCURRENCY", "4")),
+        "files_export_batch_size": int(os.getenv("FILES_EXPORT_BATCH_SIZE", "1")),
+        "status_poll_concurrency": int(os.getenv("STATUS_POLL_CONCURRENCY", "8")),
+        "poll_initial_delay": float(os.getenv("POLL_INITIAL_DELAY", "1")),
+        "poll_max_delay": float(os.getenv("POLL_MAX_DELAY", "30")),
+        "poll_backoff": float(os.getenv("POLL_BACKOFF", "1.5")),
+        "poll_jitter": float(os.getenv("POLL_JITTER", "0.2")),
+        "files_delete_batch_size": int(os.getenv("FILES_DELETE_BATCH_SIZE", "50")),
+        "files_delete_retries": int(os.getenv("FILES_DELETE_RETRIES", "3")),
+        "upload_chunk_size": int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024))),
+        "upload_use_mmap": os.getenv("UPLOAD_USE_MMAP", "false").lower() in ("1", "true", "yes"),
+        "text_batch_max_size": int(os.getenv("TEXT_BATCH_MAX_SIZE", "50")),
+        "text_chunk_words": int(os.getenv("TEXT_CHUNK_WORDS", "2000")),
+        "text_chunk_concurrency": int(os.getenv("TEXT_CHUNK_CONCURRENCY", "4")),
+        "cache_dir": os.getenv("CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".smartcat_cache"),
+        "text_cache_enabled": os.getenv("TEXT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+        "text_cache_max_entries": int(os.getenv("TEXT_CACHE_MAX_ENTRIES", "1000")),
+        "text_cache_ttl": int(os.getenv("TEXT_CACHE_TTL", str(7 * 24 * 3600))),
+        "segment_cache_enabled": os.getenv("SEGMENT_CACHE_ENABLED", "false").lower() in ("1", "true", "yes"),
+        "segment_cache_max_entries": int(os.getenv("SEGMENT_CACHE_MAX_ENTRIES", "100000")),
+        "file_cache_enabled": os.getenv("FILE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+        "file_cache_max_mb": int(os.getenv("FILE_CACHE_MAX_MB", "1024")),
+        "job_journal_enabled": os.getenv("JOB_JOURNAL_ENABLED", "true").lower() in ("1", "true", "yes"),
+        "http_pool_size": int(os.getenv("HTTP_POOL_SIZE", "10")),
+        "http_connect_timeout": float(os.getenv("HTTP_CONNECT_TIMEOUT", "10")),
+        "http_read_timeout": float(os.getenv("HTTP_READ_TIMEOUT", "60")),
+        "http_keep_alive": os.getenv("HTTP_KEEP_ALIVE", "true").lower() in ("1", "true", "yes"),
+        "http_max_retries": int(os.getenv("HTTP_MAX_RETRIES", "3")),
+        "http_backoff_base": float(os.getenv("HTTP_BACKOFF_BASE", "0.5")),
+        "http_backoff_max": float(os.getenv("HTTP_BACKOFF_MAX", "30")),
+        "http_retry_after_max": float(os.getenv("HTTP_RETRY_AFTER_MAX", "120")),
+        "http_rate_limit": float(os.getenv("HTTP_RATE_LIMIT", "10")),
+        "http_rate_burst": int(os.getenv("HTTP_RATE_BURST", "20")),
+        "http_poll_rate_limit": float(os.getenv("HTTP_POLL_RATE_LIMIT", "0")),
+        "trace_file": os.getenv("TRACE_FILE", ""),
+        "metrics_port": int(os.getenv("METRICS_PORT", "0")),
+        "metrics_host": os.getenv("METRICS_HOST", "127.0.0.1"),
+        "metrics_textfile": os.getenv("METRICS_TEXTFILE", ""),
+        "metrics_textfile_interval": float(os.getenv("METRICS_TEXTFILE_INTERVAL", "15")),
     }
@@ -1,5 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
 from PyQt5.QtCore import pyqtSignal
+from services.polling import PollScheduler
+from services.trace import TraceWriter
 
 
 class BaseTranslationTab(QWidget):
@@ -20,6 +22,14 @@ class BaseTranslationTab(QWidget):
         self.config = config
         self.status_handler = status_handler
         self.worker = None
+        # Shared across runs so that the poll scheduler keeps learning pretranslation times.
+        self.poll_scheduler = PollScheduler(
+            config["poll_initial_delay"],
+            config["poll_max_delay"],
+            config["poll_backoff"],
+            config["poll_jitter"],
+        )
+        self.trace_writer = TraceWriter(config["trace_file"]) if config["trace_file"] else None
 
         _layout = QVBoxLayout(self)
         self.setLayout(_layout)
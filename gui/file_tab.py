@@ -11,6 +11,8 @@ from PyQt5.QtWidgets import (
     QLineEdit,
 )
 from workers.file_worker import FileTranslationWorker
+from services.file_cache import FileCache
+from services.job_journal import JobJournal
 from gui.base_tab import BaseTranslationTab
 
 
@@ -26,6 +28,16 @@ class FileTranslationTab(BaseTranslationTab):
         self.output_folder_input = None
         self.translate_button = None
         self.file_results_output = None
+        self.file_cache = None
+        if config["file_cache_enabled"]:
+            self.file_cache = FileCache(
+                os.path.join(config["cache_dir"], "files"),
+                config["file_cache_max_mb"] * 1024 * 1024,
+            )
+
+        self.journal = None
+        if config["job_journal_enabled"]:
+            self.journal = JobJournal(os.path.join(config["cache_dir"], "jobs.sqlite3"))
 
         self.setup_ui()
         self.setup_signals()
@@ -90,7 +102,12 @@ class FileTranslationTab(BaseTranslationTab):
             self, "Select files", "", "All Files (*.*)"
         )
         if files:
-            self.selected_files.extend(files)
+            selected = {os.path.normcase(os.path.abspath(path)) for path in self.selected_files}
+            for path in files:
+                key = os.path.normcase(os.path.abspath(path))
+                if key not in selected:
+                    selected.add(key)
+                    self.selected_files.append(path)
             self._update_files_list()
             self.status_handler.enable_file_translation_button(
                 len(self.selected_files) > 0 and self.api_client is not None
@@ -144,6 +161,21 @@ class FileTranslationTab(BaseTranslationTab):
             output_folder,
             self.config["files_max_retries"],
             self.config["files_retry_delay"],
+            self.config["files_upload_concurrency"],
+            self.config["files_pipelined"],
+            self.config["files_export_concurrency"],
+            self.config["files_export_batch_size"],
+            upload_chunk_size=self.config["upload_chunk_size"],
+            upload_use_mmap=self.config["upload_use_mmap"],
+            poll_scheduler=self.poll_scheduler,
+            status_poll_concurrency=self.config["status_poll_concurrency"],
+            source_lang=self.config["source_lang"],
+            target_lang=self.config["target_lang"],
+            file_cache=self.file_cache,
+            journal=self.journal,
+            delete_batch_size=self.config["files_delete_batch_size"],
+            delete_retries=self.config["files_delete_retries"],
+            trace_writer=self.trace_writer,
         )
         self.worker.progress_updated.connect(self._handle_worker_progress)
         self.worker.file_completed.connect(self._file_translation_update)
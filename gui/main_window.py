@@ -11,7 +11,7 @@ from PyQt5.QtWidgets import (
     QTabWidget,
 )
 from config import load_env_config
-from api import SmartCAT
+from services.runtime import create_api_client, start_metrics_exporters
 
 # Імпортуємо рефакторингові вкладки та нові допоміжні класи
 from gui.status_handler import StatusHandler
@@ -25,8 +25,10 @@ class SmartCATGUI(QMainWindow):
         self.config = load_env_config()
         self.status_handler = StatusHandler(self)  # Створюємо StatusHandler
         self.tab_factory = TabFactory(self.api_client, self.config, self.status_handler)
+        self.metrics_exporters = []
 
         self.init_ui()
+        self.start_metrics()
         self.auto_connect()
 
     def init_ui(self):
@@ -123,6 +125,21 @@ class SmartCATGUI(QMainWindow):
         self.status_handler.enable_file_translation_button(False)
         self.status_handler.show_info("Configuration", "Configuration reloaded from.env file!")
 
+    def start_metrics(self):
+        try:
+            self.metrics_exporters = start_metrics_exporters(self.config)
+        except OSError as e:
+            self.status_handler.show_warning("Metrics", f"Cannot start metrics exporter:\n{str(e)}")
+
+    def closeEvent(self, event):
+        for exporter in self.metrics_exporters:
+            try:
+                exporter.stop()
+            except OSError:
+                # The final textfile write must not keep the window from closing.
+                pass
+        super().closeEvent(event)
+
     def auto_connect(self):
         if (self.config["username"] and self.config["password"] and self.config["project_id"]):
             self.connect_to_api()
@@ -131,11 +148,9 @@ class SmartCATGUI(QMainWindow):
         try:
             self.connection_status.setText("Status: Connecting...")
             self.connection_status.setStyleSheet("color: orange")
-            self.api_client = SmartCAT(
-                self.config["username"],
-                self.config["password"],
-                self.config["server_url"],
-            )
+            if self.api_client is not None:
+                self.api_client.close()
+            self.api_client = create_api_client(self.config)
             # Оновлюємо api_client у фабриці та вкладках
             self.tab_factory.api_client = self.api_client  # type: ignore
             self.text_translation_tab.api_client = self.api_client
@@ -1,5 +1,8 @@
+import os
 from PyQt5.QtWidgets import QVBoxLayout, QGroupBox, QTextEdit, QPushButton
 from workers.text_worker import TranslationWorker
+from services.translation_cache import TranslationCache
+from services.segment_store import SegmentStore
 from gui.base_tab import BaseTranslationTab
 
 
@@ -13,6 +16,19 @@ class TextTranslationTab(BaseTranslationTab):
         self.text_input = None
         self.translate_button = None
         self.result_output = None
+        self.translation_cache = None
+        if config["text_cache_enabled"]:
+            self.translation_cache = TranslationCache(
+                os.path.join(config["cache_dir"], "text_translations.sqlite3"),
+                config["text_cache_max_entries"],
+                config["text_cache_ttl"],
+            )
+        self.segment_store = None
+        if config["segment_cache_enabled"]:
+            self.segment_store = SegmentStore(
+                os.path.join(config["cache_dir"], "segments.sqlite3"),
+                config["segment_cache_max_entries"],
+            )
 
         self.setup_ui()
         self.setup_signals()
@@ -72,6 +88,12 @@ class TextTranslationTab(BaseTranslationTab):
             self.config["target_lang"],
             self.config["max_retries"],
             self.config["retry_delay"],
+            poll_scheduler=self.poll_scheduler,
+            translation_cache=self.translation_cache,
+            segment_store=self.segment_store,
+            chunk_words=self.config["text_chunk_words"],
+            chunk_concurrency=self.config["text_chunk_concurrency"],
+            trace_writer=self.trace_writer,
         )
         self.worker.progress_updated.connect(self._handle_worker_progress)
         self.worker.translation_completed.connect(self._text_translation_finished)
@@ -0,0 +1,29 @@
+import os
+import stat
+import tempfile
+
+# os.umask can only be read by setting it; do that once, before any worker thread starts.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_atomically(full_path, chunks):
+    """Writes byte chunks to a temporary file next to ``full_path`` and renames it into place.
+
+    The result keeps the mode of the file it replaces, or gets the umask-based mode of a
+    newly created file instead of the owner-only mode of temporary files.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(full_path) or ".", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        try:
+            mode = stat.S_IMODE(os.stat(full_path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, full_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
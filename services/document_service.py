@@ -1,112 +1,557 @@
+import io
 import os
+import re
 import json
 import time
+import threading
+import zipfile
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from services.atomic_write import write_atomically
+from services.file_cache import FileCache
+from services.hashing import file_digest
+from services.metrics import REGISTRY
+from services.multipart import MultipartFileStream
+from services.polling import PollScheduler
+from services.segment_store import SegmentStore, split_segments, join_segments
+from services.text_chunks import split_chunks
+from services.trace import DocumentTrace
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class DocumentService:
-    def __init__(self, api_client, project_id, max_retries, retry_delay):
+    def __init__(self, api_client, project_id, max_retries, retry_delay,
+                 upload_chunk_size=1024 * 1024, upload_use_mmap=False, poll_scheduler=None,
+                 status_poll_concurrency=8, source_lang=None, target_lang=None, file_cache=None,
+                 metrics=None, trace_fn=None):
         self.api_client = api_client
         self.project_id = project_id
+        self.source_lang = source_lang
+        self.target_lang = target_lang
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.upload_chunk_size = upload_chunk_size
+        self.upload_use_mmap = upload_use_mmap
+        self.poll_scheduler = poll_scheduler or PollScheduler()
+        self.status_poll_concurrency = status_poll_concurrency
+        self.file_cache = file_cache
+        self.metrics = metrics if metrics is not None else REGISTRY
+        self.trace_fn = trace_fn
+        self._digests = {}
+        self._uploads = {}
+        self._traces = {}
+        self._export_tasks = {}
+        self._trace_lock = threading.Lock()
 
     def upload_text_document(self, text):
-        data = {"data": text}
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8") as tmp:
-            json.dump(data, tmp, ensure_ascii=False, indent=2)
-            temp_path = tmp.name
-        with open(temp_path, "rb") as f:
-            files = {"file": (f"source_text_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", f, "multipart/form-data")}
-            response = self.api_client.project.attach_document(self.project_id, files)
+        return self.upload_json_document({"data": text})
+
+    def upload_json_document(self, data):
+        payload = io.BytesIO(json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+        filename = f"source_text_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        files = {"file": (filename, payload, "multipart/form-data")}
+        started = time.time()
+        response = self.api_client.project.attach_document(self.project_id, files)
         if response.status_code != 200:
             raise Exception(f"Upload failed: {response.status_code} - {response.text}")
         doc_data = response.json()
         doc_id = doc_data[0]["id"] if isinstance(doc_data, list) else doc_data["id"]
-        return doc_id, temp_path
+        self._track_upload(doc_id, len(payload.getvalue()))
+        self._start_trace(doc_id, filename, len(payload.getvalue()), started)
+        return doc_id
+
+    def translate_texts(self, texts, log_fn):
+        """Translates ``{key: text}`` as a single JSON document and returns ``{key: translation}``."""
+        log_fn("Creating and uploading text document...")
+        doc_id = self.upload_json_document(texts)
+        try:
+            log_fn("Checking translation status...")
+            self.wait_for_translation(doc_id, log_fn)
+            log_fn("Requesting export...")
+            task_id = self.request_export(doc_id)
+            log_fn("Downloading translation result...")
+            return self.download_translation_json(task_id)
+        finally:
+            self.delete_document(doc_id)
+
+    def translate_segmented(self, text, segment_store, log_fn):
+        """Translates text sentence by sentence, serving known segments from ``segment_store``.
+
+        Only the segments missing from the store are sent to SmartCAT, in one document;
+        the translation is stitched back together in the original order and layout.
+        """
+        segments, separators = split_segments(text)
+        keys = [
+            SegmentStore.make_key(segment, self.source_lang, self.target_lang, self.project_id)
+            for segment in segments
+        ]
+        known = segment_store.get_many(key for key, segment in zip(keys, segments) if segment.strip())
+
+        missing = {}
+        for key, segment in zip(keys, segments):
+            if segment.strip() and key not in known:
+                missing[key] = segment
+        log_fn(f"{len(segments) - len(missing)}/{len(segments)} segments found in translation memory")
+        self.metrics.inc("smartcat_cache_requests_total", len(known), cache="segment", result="hit")
+        self.metrics.inc("smartcat_cache_requests_total", len(missing), cache="segment", result="miss")
+
+        if missing:
+            batch = {f"s{i}": segment for i, segment in enumerate(missing.values())}
+            translated = self.translate_texts(batch, log_fn)
+            if any(key not in translated for key in batch):
+                raise Exception("Translation missing from batch result")
+            fresh = {key: translated[f"s{i}"] for i, key in enumerate(missing)}
+            segment_store.put_many(fresh)
+            known.update(fresh)
+
+        # Blank segments are never sent, they keep their original whitespace.
+        result = [known.get(key, segment) for key, segment in zip(keys, segments)]
+        return join_segments(result, separators)
+
+    def translate_large_text(self, text, chunk_words, max_workers, log_fn):
+        """Translates long text as parallel documents of at most ``chunk_words`` words each.
 
-    def upload_file_document(self, file_path):
-        with open(file_path, "rb") as f:
-            filename = os.path.basename(file_path)
-            files = {"file": (filename, f, "multipart/form-data")}
-            response = self.api_client.project.attach_document(self.project_id, files)
+        Text is split at paragraph boundaries, so a chunk only exceeds the budget when a single
+        paragraph does. Chunks are reassembled in the original order.
+        """
+        chunks, separators = split_chunks(text, chunk_words)
+        log_fn(f"Translating {len(chunks)} chunks ({max_workers} at a time)...")
+
+        def translate_chunk(index):
+            def chunk_log(message):
+                log_fn(f"[{index + 1}/{len(chunks)}] {message}")
+
+            translated = self.translate_texts({"data": chunks[index]}, chunk_log)
+            if "data" not in translated:
+                raise Exception("Translation missing from batch result")
+            return translated["data"]
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            translated = list(executor.map(translate_chunk, range(len(chunks))))
+        return join_segments(translated, separators)
+
+    def upload_file_document(self, file_path, progress_fn=None):
+        stream = MultipartFileStream(
+            "file",
+            file_path,
+            "multipart/form-data",
+            chunk_size=self.upload_chunk_size,
+            use_mmap=self.upload_use_mmap,
+            progress_fn=progress_fn,
+        )
+        started = time.time()
+        with stream:
+            response = self.api_client.project.attach_document(
+                self.project_id, data=stream, headers={"Content-Type": stream.content_type}
+            )
         if response.status_code != 200:
             raise Exception(f"Upload failed: {response.status_code} - {response.text}")
         doc_data = response.json()
-        return doc_data[0]["id"] if isinstance(doc_data, list) else doc_data["id"]
+        doc_id = doc_data[0]["id"] if isinstance(doc_data, list) else doc_data["id"]
+        self._track_upload(doc_id, os.path.getsize(file_path))
+        self._start_trace(doc_id, os.path.basename(file_path), os.path.getsize(file_path), started)
+        return doc_id
+
+    def upload_files(self, file_paths, max_workers, log_fn=None, uploaded_fn=None):
+        """Uploads files concurrently, yielding ``(path, doc_id, error)`` as each upload finishes.
+
+        ``uploaded_fn(path, doc_id)`` runs on the upload thread as soon as a document exists, so it
+        sees every created document even when the caller stops consuming early. Uploads that have
+        not started by then are cancelled.
+        """
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        try:
+            futures = {
+                executor.submit(self._upload_and_report, path, log_fn, uploaded_fn): path
+                for path in file_paths
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    doc_id = future.result()
+                except Exception as e:
+                    yield path, None, e
+                    continue
+                yield path, doc_id, None
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _upload_and_report(self, file_path, log_fn, uploaded_fn):
+        doc_id = self.upload_file_document(file_path, self._upload_progress(file_path, log_fn))
+        if uploaded_fn is not None:
+            uploaded_fn(file_path, doc_id)
+        return doc_id
+
+    @staticmethod
+    def _upload_progress(file_path, log_fn, step=10):
+        """Returns a ``progress_fn`` that logs upload progress every ``step`` percent."""
+        if log_fn is None:
+            return None
+
+        filename = os.path.basename(file_path)
+        reported = [0]
+
+        def progress(sent, total):
+            percent = sent * 100 // total
+            if percent >= reported[0] + step:
+                reported[0] = percent - percent % step
+                log_fn(f"⬆️ {filename}: {reported[0]}% ({sent / 1048576:.1f} MB)")
+
+        return progress
+
+    def group_duplicates(self, file_paths):
+        """Groups files with identical content.
+
+        :return: ``{path: [duplicate paths]}`` keyed by the first path of every distinct content.
+        """
+        groups = {}
+        for path in file_paths:
+            try:
+                key = self.content_digest(path)
+            except OSError:
+                # Unreadable files stay on their own and fail with a proper error at upload.
+                key = path
+            groups.setdefault(key, []).append(path)
+        return {paths[0]: paths[1:] for paths in groups.values()}
+
+    def copy_translation(self, result_path, file_path, output_folder=None):
+        """Writes an already translated file to the ``_translated`` output of ``file_path``."""
+        full_path = self.translated_path(file_path, output_folder)
+        if os.path.abspath(full_path) != os.path.abspath(result_path):
+            with open(result_path, "rb") as src:
+                write_atomically(full_path, iter(lambda: src.read(DOWNLOAD_CHUNK_SIZE), b""))
+        return full_path
+
+    def cached_translation(self, file_path, output_folder=None):
+        """Writes the cached translation of ``file_path`` to its output and returns the path, or ``None``."""
+        if self.file_cache is None:
+            return None
+        cached_path = self.file_cache.get(self._file_cache_key(file_path))
+        self.metrics.inc("smartcat_cache_requests_total", cache="file", result="miss" if cached_path is None else "hit")
+        if cached_path is None:
+            return None
+        return self.copy_translation(cached_path, file_path, output_folder)
+
+    def store_translation(self, file_path, result_path):
+        if self.file_cache is not None:
+            self.file_cache.put(self._file_cache_key(file_path), result_path)
+
+    def _file_cache_key(self, file_path):
+        return FileCache.make_key(self.content_digest(file_path), self.source_lang, self.target_lang, self.project_id)
+
+    def content_digest(self, file_path):
+        """Returns the SHA-256 of a file, computed once per service."""
+        if file_path not in self._digests:
+            self._digests[file_path] = file_digest(file_path)
+        return self._digests[file_path]
 
     def wait_for_translation(self, doc_id, log_fn):
-        for attempt in range(self.max_retries):
-            time.sleep(self.retry_delay)
+        deadline = time.monotonic() + self.poll_timeout
+        attempt = 0
+        while True:
+            time.sleep(self._next_poll_delay(doc_id, attempt))
+            attempt += 1
             status = self.api_client.document.get(doc_id)
+            self._trace(doc_id, "first_poll")
             if status.status_code == 200:
                 if status.json().get("pretranslateCompleted"):
+                    self._record_ready(doc_id)
                     return
             log_fn(f"Translation in progress (Pre-translated = {status.json().get('pretranslateCompleted')})")
-        raise Exception("Translation did not complete in time")
+            if time.monotonic() >= deadline:
+                raise Exception("Translation did not complete in time")
 
     def wait_for_all(self, doc_ids, log_fn):
-        for attempt in range(self.max_retries):
-            done = sum(
-                1 for doc_id in doc_ids
-                if self.api_client.document.get(doc_id).json().get("pretranslateCompleted", False)
-            )
-            log_fn(f"🕒 Waiting... {done}/{len(doc_ids)} ready")
-            if done == len(doc_ids):
-                return
-            time.sleep(self.retry_delay)
+        for _ in self.iter_ready(doc_ids, log_fn):
+            pass
+
+    def iter_ready(self, doc_ids, log_fn):
+        """Polls documents and yields the list of newly pretranslated IDs after every round.
+
+        Status checks of a round run on a pool of ``status_poll_concurrency`` threads, and documents
+        drop out of later rounds once they are ready. Documents that are still not ready after
+        ``poll_timeout`` seconds are never yielded.
+        """
+        deadline = time.monotonic() + self.poll_timeout
+        pending = list(doc_ids)
+        attempt = 0
+        with ThreadPoolExecutor(max_workers=max(1, self.status_poll_concurrency)) as executor:
+            while True:
+                statuses = executor.map(self._is_pretranslated, pending)
+                ready = [doc_id for doc_id, completed in zip(pending, statuses) if completed]
+                for doc_id in ready:
+                    self._record_ready(doc_id)
+                pending = [doc_id for doc_id in pending if doc_id not in ready]
+                log_fn(f"🕒 Waiting... {len(doc_ids) - len(pending)}/{len(doc_ids)} ready")
+                if ready:
+                    yield ready
+                if not pending or time.monotonic() >= deadline:
+                    return
+                time.sleep(min(self._next_poll_delay(doc_id, attempt) for doc_id in pending))
+                attempt += 1
+
+    def _is_pretranslated(self, doc_id):
+        try:
+            response = self.api_client.document.get(doc_id)
+            self._trace(doc_id, "first_poll")
+            return response.status_code == 200 and response.json().get("pretranslateCompleted", False)
+        except Exception:
+            # A failed status check is retried in the next round.
+            return False
+
+    @property
+    def poll_timeout(self):
+        """Total time to wait for pretranslation: ``max_retries`` polls of ``retry_delay`` seconds."""
+        return self.max_retries * self.retry_delay
+
+    def _track_upload(self, doc_id, size):
+        self._uploads[doc_id] = (time.monotonic(), size)
+        self.metrics.inc("smartcat_documents_uploaded_total")
+        self.metrics.inc("smartcat_upload_bytes_total", size)
+
+    def _next_poll_delay(self, doc_id, attempt):
+        uploaded_at, size = self._uploads.get(doc_id, (None, None))
+        elapsed = time.monotonic() - uploaded_at if uploaded_at is not None else 0.0
+        return self.poll_scheduler.next_delay(attempt, elapsed, size)
+
+    def _record_ready(self, doc_id):
+        uploaded_at, size = self._uploads.pop(doc_id, (None, None))
+        if uploaded_at is not None:
+            duration = time.monotonic() - uploaded_at
+            self.poll_scheduler.record_completion(duration, size)
+            self.metrics.observe("smartcat_pretranslation_wait_seconds", duration)
+        self._trace(doc_id, "pretranslated")
 
     def request_export(self, doc_id):
-        response = self.api_client.document.request_export([doc_id], target_type="target")
+        return self.request_batch_export([doc_id])
+
+    def request_batch_export(self, doc_ids):
+        doc_ids = list(doc_ids)
+        response = self.api_client.document.request_export(doc_ids, target_type="target")
         if response.status_code != 200:
             raise Exception(f"Export request failed: {response.status_code}")
-        return response.json().get("id")
+        task_id = response.json().get("id")
+        for doc_id in doc_ids:
+            self._trace(doc_id, "export_requested")
+        with self._trace_lock:
+            self._export_tasks[task_id] = doc_ids
+        return task_id
 
     def download_translation(self, task_id):
+        r = self._wait_for_export(task_id)
+        self.metrics.inc("smartcat_download_bytes_total", len(r.content))
+        self._trace_task(task_id, "downloaded")
+        try:
+            return json.loads(r.text).get("data", r.text)
+        except json.JSONDecodeError:
+            return r.text
+
+    def download_translation_json(self, task_id):
+        r = self._wait_for_export(task_id)
+        self.metrics.inc("smartcat_download_bytes_total", len(r.content))
+        self._trace_task(task_id, "downloaded")
+        try:
+            return json.loads(r.text)
+        except json.JSONDecodeError:
+            raise Exception("Exported translation is not valid JSON")
+
+    def download_and_save_file(self, task_id, file_path, output_folder=None):
+        r = self._wait_for_export(task_id)
+        full_path = self.translated_path(file_path, output_folder)
+        self._stream_to_file(r, full_path)
+        self._trace_task(task_id, "downloaded")
+        return os.path.basename(file_path), full_path
+
+    def download_and_save_batch(self, task_id, file_paths, output_folder=None):
+        """Downloads a multi-document export archive and unpacks it into per-file outputs.
+
+        :param file_paths: Mapping of document ID to its source file path.
+        :return: ``(saved, missing)`` where ``saved`` maps document ID to the written path
+            and ``missing`` lists document IDs that had no entry in the archive.
+        """
+        r = self._wait_for_export(task_id)
+        saved = {}
+        with tempfile.TemporaryFile() as archive:
+            try:
+                for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    archive.write(chunk)
+                    self.metrics.inc("smartcat_download_bytes_total", len(chunk))
+            finally:
+                r.close()
+            if not zipfile.is_zipfile(archive):
+                raise Exception("Batch export did not return an archive")
+
+            with zipfile.ZipFile(archive) as zf:
+                entries = [info for info in zf.infolist() if not info.is_dir()]
+                for doc_id, file_path in file_paths.items():
+                    entry = self._match_archive_entry(entries, os.path.basename(file_path))
+                    if entry is None:
+                        continue
+                    entries.remove(entry)
+                    full_path = self.translated_path(file_path, output_folder)
+                    with zf.open(entry) as src:
+                        write_atomically(full_path, iter(lambda: src.read(DOWNLOAD_CHUNK_SIZE), b""))
+                    saved[doc_id] = full_path
+                    self._trace(doc_id, "downloaded")
+        with self._trace_lock:
+            self._export_tasks.pop(task_id, None)
+        missing = [doc_id for doc_id in file_paths if doc_id not in saved]
+        return saved, missing
+
+    def _wait_for_export(self, task_id):
+        started = time.monotonic()
         for _ in range(30):
             time.sleep(self.retry_delay)
             r = self.api_client.document.download_export_result(task_id)
             if r.status_code == 200:
-                try:
-                    return json.loads(r.text).get("data", r.text)
-                except json.JSONDecodeError:
-                    return r.text
-            elif r.status_code != 202:
+                self.metrics.observe("smartcat_export_wait_seconds", time.monotonic() - started)
+                self._trace_task(task_id, "export_ready")
+                return r
+            r.close()
+            if r.status_code != 202:
                 raise Exception(f"Download failed: {r.status_code}")
         raise Exception("Download timeout")
 
-    def download_and_save_file(self, task_id, file_path, doc_id, output_folder=None):
-        for _ in range(30):
-            time.sleep(self.retry_delay)
-            r = self.api_client.document.download_export_result(task_id)
-            if r.status_code == 200:
-                output_dir = output_folder or os.path.dirname(file_path)
-                filename = os.path.basename(file_path)
-                translated_name = f"{Path(filename).stem}_translated{Path(filename).suffix}"
-                full_path = os.path.join(output_dir, translated_name)
-                with open(full_path, "wb") as f:
-                    f.write(r.content)
-                stats = self.fetch_statistics(doc_id)
-                return filename, full_path, stats
-        raise Exception("Download failed")
-
-    def fetch_statistics(self, doc_id):
+    def _stream_to_file(self, response, full_path):
+        """Streams a download to disk chunk by chunk, so memory use does not grow with file size."""
         try:
-            response = self.api_client.project.segment_confirmation_statistics(self.project_id, doc_id.split("_")[0])
-            stats = response.json() if response.status_code == 200 else []
-            mt = sum(e.get("wordcounts", {}).get("mt", 0) for e in stats if e.get("stageType") == "translation")
-            tm = sum(sum(e.get("wordcounts", {}).get("tmMatches", {}).values()) for e in stats if e.get("stageType") == "translation")
-            total = mt + tm
-            if total == 0:
-                return "\n📊 Statistics unavailable"
-            return f"\n\n📊 Statistics:\n🔢 {total} words\n🧠 MT: {mt} ({mt / total:.2%})\n📚 TM: {tm} ({tm / total:.2%})\n"
-        except Exception as e:
-            return f"\n📊 Stats error: {str(e)}"
+            chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            write_atomically(full_path, self._count_download(chunks))
+        finally:
+            response.close()
+
+    def _count_download(self, chunks):
+        for chunk in chunks:
+            self.metrics.inc("smartcat_download_bytes_total", len(chunk))
+            yield chunk
+
+    @staticmethod
+    def _match_archive_entry(entries, filename):
+        """Finds the archive entry for a source file.
+
+        An entry matches on the exact file name, or on the source stem followed by a target
+        language suffix such as ``_en`` or ``_en-US``. When several entries match only by
+        suffix, none is returned rather than guessing which one belongs to the file.
+        """
+        for entry in entries:
+            if os.path.basename(entry.filename) == filename:
+                return entry
+        stem, suffix = Path(filename).stem, Path(filename).suffix
+        pattern = re.compile(
+            re.escape(stem) + r"[_\- ]\(?[A-Za-z]{2,3}(?:[_-][A-Za-z0-9]{2,4})?\)?" + re.escape(suffix), re.IGNORECASE
+        )
+        candidates = [entry for entry in entries if pattern.fullmatch(os.path.basename(entry.filename))]
+        return candidates[0] if len(candidates) == 1 else None
+
+    @staticmethod
+    def translated_path(file_path, output_folder=None):
+        output_dir = output_folder or os.path.dirname(file_path)
+        filename = os.path.basename(file_path)
+        translated_name = f"{Path(filename).stem}_translated{Path(filename).suffix}"
+        return os.path.join(output_dir, translated_name)
+
+    def fetch_word_counts(self, doc_id):
+        """Returns the ``(mt, tm)`` word counts of a document."""
+        response = self.api_client.project.segment_confirmation_statistics(self.project_id, doc_id.split("_")[0])
+        stats = response.json() if response.status_code == 200 else []
+        mt = sum(e.get("wordcounts", {}).get("mt", 0) for e in stats if e.get("stageType") == "translation")
+        tm = sum(sum(e.get("wordcounts", {}).get("tmMatches", {}).values()) for e in stats if e.get("stageType") == "translation")
+        return mt, tm
+
+    @staticmethod
+    def format_statistics(mt, tm):
+        total = mt + tm
+        if total == 0:
+            return "\n📊 Statistics unavailable"
+        return f"\n\n📊 Statistics:\n🔢 {total} words\n🧠 MT: {mt} ({mt / total:.2%})\n📚 TM: {tm} ({tm / total:.2%})\n"
 
     def delete_document(self, doc_id):
-        try:
-            self.api_client.document.delete(doc_id)
-        except Exception:
-            pass
+        """Deletes one document; returns False instead of raising when it could not be deleted."""
+        return not self.delete_documents([doc_id])
+
+    def delete_documents(self, doc_ids, batch_size=50, retries=3):
+        """Deletes documents in groups of ``batch_size``, retrying every failed group.
+
+        A group that still fails is retried document by document, so that one bad ID
+        does not keep the rest of its group alive.
+
+        :return: ``{doc_id: error}`` for the documents that could not be deleted.
+        """
+        doc_ids = list(doc_ids)
+        batch_size = max(1, batch_size)
+        failed = {}
+        for start in range(0, len(doc_ids), batch_size):
+            batch = doc_ids[start:start + batch_size]
+            error = None
+            for attempt in range(retries + 1):
+                if attempt:
+                    time.sleep(min(self.retry_delay, 2 ** attempt))
+                try:
+                    response = self.api_client.document.delete(batch)
+                except Exception as e:
+                    error = str(e)
+                    continue
+                if response.status_code < 300:
+                    error = None
+                    break
+                error = f"Delete failed: {response.status_code}"
+
+            if error is None:
+                continue
+            if len(batch) > 1:
+                failed.update(self.delete_documents(batch, batch_size=1, retries=0))
+            else:
+                failed[batch[0]] = error
+
+        for doc_id in doc_ids:
+            if doc_id in failed:
+                self.finish_trace(doc_id, failed[doc_id])
+            else:
+                self._trace(doc_id, "deleted")
+                self.finish_trace(doc_id)
+        return failed
+
+    def finish_trace(self, doc_id, error=None):
+        """Closes the stage trace of a document and hands it to ``trace_fn``."""
+        with self._trace_lock:
+            trace = self._traces.pop(doc_id, None)
+        if trace is None:
+            return
+        trace.error = error
+        self.trace_fn(trace.to_dict())
+
+    def flush_traces(self, error="Not finished"):
+        """Closes the traces of all documents that never reached deletion."""
+        with self._trace_lock:
+            doc_ids = list(self._traces)
+            self._export_tasks.clear()
+        for doc_id in doc_ids:
+            self.finish_trace(doc_id, error)
+
+    def _start_trace(self, doc_id, file_name, size, started):
+        if self.trace_fn is None:
+            return
+        trace = DocumentTrace(doc_id, file_name, size)
+        trace.mark("upload_started", started)
+        trace.mark("uploaded")
+        with self._trace_lock:
+            self._traces[doc_id] = trace
+
+    def _trace(self, doc_id, stage):
+        with self._trace_lock:
+            trace = self._traces.get(doc_id)
+            if trace is not None:
+                trace.mark(stage)
+
+    def _trace_task(self, task_id, stage):
+        with self._trace_lock:
+            # An export task is done with once its result is downloaded.
+            if stage == "downloaded":
+                doc_ids = self._export_tasks.pop(task_id, [])
+            else:
+                doc_ids = self._export_tasks.get(task_id, [])
+        for doc_id in doc_ids:
+            self._trace(doc_id, stage)
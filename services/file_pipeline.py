@@ -0,0 +1,353 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from services.document_service import DocumentService
+from services.job_journal import JobJournal
+
+# Threads fetching statistics of delivered files in the background.
+STATISTICS_CONCURRENCY = 2
+
+
+class FilePipeline:
+    """
+    Translates a batch of files: deduplication, local cache, job journal resume, concurrent uploads,
+    pipelined or batched exports, background statistics and deferred cleanup.
+
+    Progress is reported through plain callbacks, so the same pipeline drives the GUI worker and
+    the headless command line:
+
+    - ``progress_fn(message)`` for job progress,
+    - ``file_fn(file_name, status)`` for per-file results,
+    - ``trace_fn(trace)`` for the stage trace of every finished document.
+    """
+
+    def __init__(self, api_client, file_paths, project_id, output_folder=None, max_retries=5, retry_delay=60,
+                 upload_concurrency=4, pipelined=True, export_concurrency=4, export_batch_size=1,
+                 upload_chunk_size=1024 * 1024, upload_use_mmap=False, poll_scheduler=None,
+                 status_poll_concurrency=8, source_lang=None, target_lang=None, file_cache=None, journal=None,
+                 delete_batch_size=50, delete_retries=3, trace_writer=None,
+                 progress_fn=None, file_fn=None, trace_fn=None):
+        self.service = DocumentService(
+            api_client, project_id, max_retries, retry_delay,
+            upload_chunk_size=upload_chunk_size, upload_use_mmap=upload_use_mmap, poll_scheduler=poll_scheduler,
+            status_poll_concurrency=status_poll_concurrency,
+            source_lang=source_lang, target_lang=target_lang, file_cache=file_cache,
+            trace_fn=self._on_trace,
+        )
+        self.trace_writer = trace_writer
+        self.progress_fn = progress_fn or (lambda message: None)
+        self.file_fn = file_fn or (lambda file_name, status: None)
+        self.trace_fn = trace_fn
+        self.file_paths = file_paths
+        self.output_folder = output_folder
+        self.upload_concurrency = upload_concurrency
+        self.pipelined = pipelined
+        self.export_concurrency = export_concurrency
+        self.export_batch_size = export_batch_size
+        self.journal = journal
+        self.delete_batch_size = delete_batch_size
+        self.delete_retries = delete_retries
+        self.job_id = JobJournal.make_job_id(project_id, file_paths, output_folder)
+        self.duplicates = {}
+        self.translated, self.failed = [], []
+        self.pending_deletes, self.undeleted = {}, {}
+        self.word_counts = [0, 0]
+        self._statistics_lock = threading.Lock()
+
+    def run(self):
+        """Runs the job and returns its summary; per-file failures are collected in :attr:`failed`."""
+        self.translated, self.failed = [], []
+        self.pending_deletes, self.undeleted = {}, {}
+        self.word_counts = [0, 0]
+        self._statistics_executor = ThreadPoolExecutor(max_workers=STATISTICS_CONCURRENCY)
+
+        try:
+            self.progress_fn(f"Checking {len(self.file_paths)} files for duplicates...")
+            self.duplicates = self.service.group_duplicates(self.file_paths)
+            unique_paths = list(self.duplicates)
+            skipped = len(self.file_paths) - len(unique_paths)
+            if skipped:
+                self.progress_fn(f"{skipped} duplicate files will reuse the translation of identical files")
+
+            unique_paths = [path for path in unique_paths if not self._deliver_cached(path)]
+            unique_paths, successful, ready = self._resume(unique_paths)
+
+            self.progress_fn(
+                f"Uploading {len(unique_paths)} files ({self.upload_concurrency} at a time)..."
+            )
+            uploads = self.service.upload_files(
+                unique_paths, self.upload_concurrency, self.progress_fn, self._record_upload
+            )
+            for path, document_id, error in uploads:
+                if error is not None:
+                    self._fail(path, str(error))
+                    continue
+                self.progress_fn(f"Uploaded {os.path.basename(path)} with ID {document_id}")
+                self.file_fn(os.path.basename(path), f"⬆️ Uploaded with ID {document_id}")
+                successful.append((path, document_id))
+
+            if self.pipelined:
+                self._export_pipelined(successful, ready)
+            else:
+                self._export_after_all(successful, ready)
+        finally:
+            self._statistics_executor.shutdown(wait=True)
+
+        self._cleanup()
+        self.service.flush_traces()
+        # Every input must be accounted for, otherwise the journal is still needed to resume.
+        self._fail_unfinished(self.file_paths, "Not processed")
+        if self.journal is not None and not self.failed and not self.undeleted:
+            self.journal.finish(self.job_id)
+
+        summary = f"✅ {len(self.translated)} translated, ❌ {len(self.failed)} failed."
+        if self.undeleted:
+            summary += f" 🗑️ {len(self.undeleted)} documents could not be deleted."
+        if any(self.word_counts):
+            summary += self.service.format_statistics(*self.word_counts)
+        return summary
+
+    def _export_pipelined(self, successful, ready):
+        """Exports every document as soon as its own pretranslation completes."""
+        paths = {doc_id: path for path, doc_id in successful}
+        exports = []
+        with ThreadPoolExecutor(max_workers=max(1, self.export_concurrency)) as executor:
+            for batch in self._export_batches(ready):
+                exports.append((batch, executor.submit(self._export_batch, batch)))
+            for newly_ready in self.service.iter_ready(list(paths), self.progress_fn):
+                for doc_id in newly_ready:
+                    self._record(paths[doc_id], JobJournal.PRETRANSLATED)
+                for batch in self._export_batches({doc_id: paths.pop(doc_id) for doc_id in newly_ready}):
+                    exports.append((batch, executor.submit(self._export_batch, batch)))
+
+        for batch, future in exports:
+            try:
+                future.result()
+            except Exception as e:
+                self._fail_unfinished(batch.values(), str(e))
+
+        for doc_id, path in paths.items():
+            self._fail(path, "Translation did not complete in time")
+
+    def _export_after_all(self, successful, ready):
+        """Waits for every pretranslation to finish or time out, then exports the ready documents."""
+        paths = {doc_id: path for path, doc_id in successful}
+        ready = dict(ready)
+        for newly_ready in self.service.iter_ready(list(paths), self.progress_fn):
+            for doc_id in newly_ready:
+                self._record(paths[doc_id], JobJournal.PRETRANSLATED)
+                ready[doc_id] = paths.pop(doc_id)
+
+        for batch in self._export_batches(ready):
+            try:
+                self._export_batch(batch)
+            except Exception as e:
+                self._fail_unfinished(batch.values(), str(e))
+
+        for doc_id, path in paths.items():
+            self._fail(path, "Translation did not complete in time")
+
+    def _resume(self, paths):
+        """Splits files by the stage recorded in the job journal and finishes already downloaded ones.
+
+        :return: ``(to_upload, uploaded, ready)``: paths that still need uploading, ``(path, doc_id)``
+            pairs waiting for pretranslation and ``{doc_id: path}`` of documents ready for export.
+        """
+        records = self.journal.load(self.job_id) if self.journal is not None else {}
+        to_upload, uploaded, ready = [], [], {}
+        for path in paths:
+            record = records.get(path)
+            try:
+                unchanged = record is not None and record["digest"] == self.service.content_digest(path)
+            except OSError:
+                unchanged = False
+            if not unchanged:
+                to_upload.append(path)
+                continue
+
+            stage, doc_id = record["stage"], record["doc_id"]
+            if stage in (JobJournal.DOWNLOADED, JobJournal.DELETED):
+                result_path = self.service.translated_path(path, self.output_folder)
+                if os.path.exists(result_path):
+                    if stage == JobJournal.DOWNLOADED:
+                        self._delete(path, doc_id)
+                    self._deliver(path, result_path, "\n♻️ Resumed from job journal")
+                elif stage == JobJournal.DELETED:
+                    to_upload.append(path)
+                else:
+                    ready[doc_id] = path
+            elif stage == JobJournal.UPLOADED:
+                uploaded.append((path, doc_id))
+            else:
+                # Export tasks do not outlive their results, so exported documents are exported again.
+                ready[doc_id] = path
+
+        resumed = len(paths) - len(to_upload)
+        if resumed:
+            self.progress_fn(f"♻️ Resuming {resumed} files from the job journal")
+        return to_upload, uploaded, ready
+
+    def _export_batches(self, paths):
+        """Splits ``{doc_id: path}`` into export groups of at most ``export_batch_size`` files.
+
+        File names must be unique inside a group, because they identify the entries of the exported archive.
+        """
+        batches = []
+        for doc_id, path in paths.items():
+            name = os.path.basename(path)
+            batch = next(
+                (b for b in batches
+                 if len(b) < self.export_batch_size and name not in map(os.path.basename, b.values())),
+                None,
+            )
+            if batch is None:
+                batch = {}
+                batches.append(batch)
+            batch[doc_id] = path
+        return batches
+
+    def _export_batch(self, batch):
+        if len(batch) == 1:
+            (doc_id, path), = batch.items()
+            self._export_file(path, doc_id)
+            return
+
+        try:
+            self.progress_fn(f"Exporting {len(batch)} documents in one task...")
+            task_id = self.service.request_batch_export(batch)
+            for path in batch.values():
+                self._record(path, JobJournal.EXPORTED, task_id=task_id)
+            saved, missing = self.service.download_and_save_batch(task_id, batch, self.output_folder)
+        except Exception as e:
+            for path in batch.values():
+                self._fail(path, str(e))
+            return
+
+        for doc_id, result_path in saved.items():
+            path = batch[doc_id]
+            try:
+                self._record(path, JobJournal.DOWNLOADED)
+                self._delete(path, doc_id)
+            except Exception as e:
+                self._fail(path, str(e))
+                continue
+            self._deliver(path, result_path)
+            self._collect_statistics(path, doc_id)
+        for doc_id in missing:
+            self._fail(batch[doc_id], "Missing from export archive")
+
+    def _export_file(self, path, doc_id):
+        try:
+            task_id = self.service.request_export(doc_id)
+            self._record(path, JobJournal.EXPORTED, task_id=task_id)
+            _, result_path = self.service.download_and_save_file(task_id, path, self.output_folder)
+            self._record(path, JobJournal.DOWNLOADED)
+            self._delete(path, doc_id)
+        except Exception as e:
+            self._fail(path, str(e))
+            return
+        self._deliver(path, result_path)
+        self._collect_statistics(path, doc_id)
+
+    def _collect_statistics(self, path, doc_id):
+        """Fetches statistics of a delivered document in the background and adds them to the job totals."""
+        self._statistics_executor.submit(self._report_statistics, path, doc_id)
+
+    def _report_statistics(self, path, doc_id):
+        try:
+            mt, tm = self.service.fetch_word_counts(doc_id)
+        except Exception as e:
+            self.file_fn(os.path.basename(path), f"📊 Stats error: {str(e)}")
+            return
+        with self._statistics_lock:
+            self.word_counts[0] += mt
+            self.word_counts[1] += tm
+        self.file_fn(os.path.basename(path), self.service.format_statistics(mt, tm).strip())
+
+    def _delete(self, path, doc_id):
+        """Queues a delivered document for the deferred cleanup stage."""
+        self.pending_deletes[doc_id] = path
+
+    def _cleanup(self):
+        """Deletes all delivered documents in batches and reports the ones that could not be deleted."""
+        if not self.pending_deletes:
+            return
+        self.progress_fn(f"🗑️ Deleting {len(self.pending_deletes)} documents...")
+        self.undeleted = self.service.delete_documents(
+            list(self.pending_deletes), self.delete_batch_size, self.delete_retries
+        )
+        for doc_id, path in self.pending_deletes.items():
+            if doc_id not in self.undeleted:
+                self._record(path, JobJournal.DELETED)
+        for doc_id, error in self.undeleted.items():
+            self.progress_fn(
+                f"⚠️ Could not delete document {doc_id} ({os.path.basename(self.pending_deletes[doc_id])}): {error}"
+            )
+
+    def _on_trace(self, trace):
+        """Publishes the stage trace of a finished document."""
+        if self.trace_writer is not None:
+            try:
+                self.trace_writer.write(trace)
+            except OSError as e:
+                self.progress_fn(f"Could not write trace of {trace['file']}: {str(e)}")
+        if self.trace_fn is not None:
+            self.trace_fn(trace)
+
+    def _record_upload(self, path, doc_id):
+        """Journals a new document from its upload thread, before a crash or Ctrl-C could orphan it."""
+        self._record(path, JobJournal.UPLOADED, digest=self.service.content_digest(path), doc_id=doc_id)
+
+    def _record(self, path, stage, **fields):
+        if self.journal is not None:
+            self.journal.record(self.job_id, path, stage, **fields)
+
+    def _deliver_cached(self, path):
+        """Delivers a file from the local translation cache; returns False on a cache miss."""
+        try:
+            result_path = self.service.cached_translation(path, self.output_folder)
+        except Exception as e:
+            self.progress_fn(f"Cache lookup failed for {os.path.basename(path)}: {str(e)}")
+            return False
+        if result_path is None:
+            return False
+        self._deliver(path, result_path, "\n💾 Served from local cache", cached=True)
+        return True
+
+    def _deliver(self, path, result_path, stats="", cached=False):
+        """Reports a translated file and fans its result out to files with identical content."""
+        if not cached:
+            try:
+                self.service.store_translation(path, result_path)
+            except Exception as e:
+                self.progress_fn(f"Could not cache {os.path.basename(path)}: {str(e)}")
+        self.file_fn(os.path.basename(path), f"✅ Saved to {result_path}{stats}")
+        self.translated.append(path)
+        self.service.metrics.inc("smartcat_files_processed_total", result="translated")
+        for duplicate in self.duplicates.get(path, []):
+            try:
+                duplicate_path = self.service.copy_translation(result_path, duplicate, self.output_folder)
+            except Exception as e:
+                self.file_fn(duplicate, f"❌ {str(e)}")
+                self.failed.append((duplicate, str(e)))
+                self.service.metrics.inc("smartcat_files_processed_total", result="failed")
+                continue
+            self.file_fn(
+                os.path.basename(duplicate), f"✅ Saved to {duplicate_path} (same content as {os.path.basename(path)})"
+            )
+            self.translated.append(duplicate)
+            self.service.metrics.inc("smartcat_files_processed_total", result="translated")
+
+    def _fail_unfinished(self, paths, error):
+        """Fails the paths that were neither translated nor failed yet."""
+        finished = {*self.translated, *(path for path, _ in self.failed)}
+        for path in paths:
+            if path not in finished:
+                self._fail(path, error)
+                finished.update([path, *self.duplicates.get(path, [])])
+
+    def _fail(self, path, error):
+        for failed_path in [path, *self.duplicates.get(path, [])]:
+            self.file_fn(failed_path, f"❌ {error}")
+            self.failed.append((failed_path, error))
+            self.service.metrics.inc("smartcat_files_processed_total", result="failed")
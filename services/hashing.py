@@ -0,0 +1,7 @@
+import hashlib
+
+
+def file_digest(file_path, algorithm="sha256"):
+    """Returns the hex digest of a file, read in chunks so that large files are never loaded whole."""
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, algorithm).hexdigest()
@@ -0,0 +1,61 @@
+import json
+import time
+import hashlib
+from services.sqlite_store import SQLiteStore
+
+
+class JobJournal(SQLiteStore):
+    """
+    Durable record of how far every file of a batch job has progressed.
+
+    Each file moves through :attr:`STAGES`; a restarted job with the same inputs reads the
+    journal back and resumes every file from its last completed stage instead of uploading
+    and pretranslating it again.
+    """
+
+    UPLOADED = "uploaded"
+    PRETRANSLATED = "pretranslated"
+    EXPORTED = "exported"
+    DOWNLOADED = "downloaded"
+    DELETED = "deleted"
+    STAGES = (UPLOADED, PRETRANSLATED, EXPORTED, DOWNLOADED, DELETED)
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS job_files ("
+        "job_id TEXT NOT NULL, path TEXT NOT NULL, digest TEXT, doc_id TEXT, task_id TEXT, "
+        "stage TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (job_id, path))",
+    )
+
+    @staticmethod
+    def make_job_id(project_id, file_paths, output_folder=None):
+        payload = json.dumps([project_id, sorted(file_paths), output_folder])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self, job_id):
+        """Returns ``{path: {"digest", "doc_id", "task_id", "stage"}}`` for a job."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT path, digest, doc_id, task_id, stage FROM job_files WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {
+            path: {"digest": digest, "doc_id": doc_id, "task_id": task_id, "stage": stage}
+            for path, digest, doc_id, task_id, stage in rows
+        }
+
+    def record(self, job_id, path, stage, digest=None, doc_id=None, task_id=None):
+        """Moves a file to ``stage``; fields left as ``None`` keep their recorded values."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO job_files (job_id, path, digest, doc_id, task_id, stage, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_id, path) DO UPDATE SET "
+                "digest = COALESCE(excluded.digest, digest), doc_id = COALESCE(excluded.doc_id, doc_id), "
+                "task_id = COALESCE(excluded.task_id, task_id), stage = excluded.stage, "
+                "updated_at = excluded.updated_at",
+                (job_id, path, digest, doc_id, task_id, stage, time.time()),
+            )
+
+    def finish(self, job_id):
+        """Drops the journal of a job that completed without failures."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
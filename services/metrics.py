@@ -0,0 +1,207 @@
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from api import MetricsSink
+from services.atomic_write import write_atomically
+
+# Pretranslation and export can take from seconds to many minutes.
+WAIT_BUCKETS = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0)
+REQUEST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsRegistry(MetricsSink):
+    """
+    Counters and histograms of translation jobs, rendered in the Prometheus text format.
+
+    :class:`~services.document_service.DocumentService` and the workers report job progress here,
+    and passing the registry to :class:`~api.SmartCAT` as ``metrics`` adds per-endpoint request timings.
+    Publish it with :class:`MetricsServer` or :class:`TextfileWriter`.
+    """
+
+    METRICS = {
+        "smartcat_documents_uploaded_total": ("counter", "Documents uploaded to SmartCAT.", None),
+        "smartcat_upload_bytes_total": ("counter", "Source bytes uploaded.", None),
+        "smartcat_download_bytes_total": ("counter", "Translated bytes downloaded.", None),
+        "smartcat_pretranslation_wait_seconds": (
+            "histogram", "Time from upload until pretranslation completed.", WAIT_BUCKETS,
+        ),
+        "smartcat_export_wait_seconds": (
+            "histogram", "Time from export request until the result was ready.", WAIT_BUCKETS,
+        ),
+        "smartcat_cache_requests_total": ("counter", "Local cache lookups by cache and result.", None),
+        "smartcat_cache_hit_ratio": ("gauge", "Share of local cache lookups that were hits.", None),
+        "smartcat_files_processed_total": ("counter", "Files finished by result.", None),
+        "smartcat_texts_processed_total": ("counter", "Text translations finished by result.", None),
+        "smartcat_api_requests_total": ("counter", "API request attempts by endpoint and status.", None),
+        "smartcat_api_retries_total": ("counter", "API request retries by endpoint.", None),
+        "smartcat_api_request_duration_seconds": (
+            "histogram", "API request latency until response headers.", REQUEST_BUCKETS,
+        ),
+        "smartcat_api_sent_bytes_total": ("counter", "API request body bytes by endpoint.", None),
+        "smartcat_api_received_bytes_total": ("counter", "API response body bytes by endpoint.", None),
+    }
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        buckets = self.METRICS[name][2]
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._values.get(key)
+            if histogram is None:
+                histogram = self._values[key] = {"buckets": [0] * (len(buckets) + 1), "sum": 0.0, "count": 0}
+            histogram["buckets"][bisect.bisect_left(buckets, value)] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def record_request(self, endpoint, method, status, latency, bytes_sent, bytes_received, attempt):
+        self.inc("smartcat_api_requests_total", endpoint=endpoint, status=status)
+        self.observe("smartcat_api_request_duration_seconds", latency, endpoint=endpoint)
+        self.inc("smartcat_api_sent_bytes_total", bytes_sent, endpoint=endpoint)
+        self.inc("smartcat_api_received_bytes_total", bytes_received, endpoint=endpoint)
+        if attempt:
+            self.inc("smartcat_api_retries_total", endpoint=endpoint)
+
+    def render(self):
+        """Returns all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            values = {key: (dict(value, buckets=list(value["buckets"])) if isinstance(value, dict) else value)
+                      for key, value in self._values.items()}
+        values.update(self._hit_ratios(values))
+
+        lines = []
+        for name, (kind, help_text, buckets) in self.METRICS.items():
+            samples = sorted((labels, value) for (metric, labels), value in values.items() if metric == name)
+            if not samples:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if kind != "histogram":
+                    lines.append(f"{name}{self._labels(labels)} {value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip((*buckets, "+Inf"), value["buckets"]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{self._labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{self._labels(labels)} {value['sum']}")
+                lines.append(f"{name}_count{self._labels(labels)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _hit_ratios(values):
+        lookups = {}
+        for (name, labels), value in values.items():
+            if name == "smartcat_cache_requests_total":
+                labels = dict(labels)
+                hits, total = lookups.get(labels["cache"], (0, 0))
+                lookups[labels["cache"]] = (hits + (value if labels["result"] == "hit" else 0), total + value)
+        return {
+            ("smartcat_cache_hit_ratio", (("cache", cache),)): hits / total
+            for cache, (hits, total) in lookups.items() if total
+        }
+
+    @staticmethod
+    def _labels(labels):
+        if not labels:
+            return ""
+        pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+        return "{" + pairs + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+#: Registry shared by all services and workers of the process.
+REGISTRY = MetricsRegistry()
+
+
+class MetricsServer:
+    """Serves a registry at ``/metrics`` for Prometheus to scrape, from a daemon thread."""
+
+    def __init__(self, registry=REGISTRY, port=9464, host="127.0.0.1"):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class TextfileWriter:
+    """
+    Writes a registry to a ``.prom`` file every ``interval`` seconds,
+    for the node_exporter textfile collector on hosts without an open metrics port.
+    """
+
+    def __init__(self, path, registry=REGISTRY, interval=15.0):
+        self.path = path
+        self.registry = registry
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the writer and writes the final values."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+    def write(self):
+        # The collector must never read a half-written file.
+        write_atomically(self.path, [self.registry.render().encode("utf-8")])
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.write()
+            except OSError:
+                # A full or unmounted disk must not stop the job; the next write tries again.
+                pass
@@ -0,0 +1,115 @@
+import os
+import mmap
+import uuid
+
+
+class MultipartFileStream:
+    """
+    Streaming ``multipart/form-data`` body for a single file.
+
+    Unlike ``requests`` multipart encoding, the body is never built in memory: the file is read
+    in fixed-size chunks (optionally through ``mmap``) while the request is being sent.
+    Pass it as ``data=`` together with ``headers={"Content-Type": stream.content_type}``.
+
+    The stream is deliberately iterable rather than file-like: urllib3 reads file-like bodies
+    in its own 16 KiB blocks, but sends iterables as they are yielded, so ``chunk_size`` is
+    what goes to the socket per write and ``progress_fn`` fires once per chunk.
+    ``seek``/``tell`` are kept so that a retried request can rewind the body.
+    """
+
+    def __init__(self, field_name, file_path, content_type="application/octet-stream",
+                 chunk_size=1024 * 1024, use_mmap=False, progress_fn=None):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.filename = os.path.basename(file_path)
+        self.chunk_size = chunk_size
+        self.progress_fn = progress_fn
+
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{self._quote(field_name)}"; '
+            f'filename="{self._quote(self.filename)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+        self._file = open(file_path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._mmap = None
+        if use_mmap and self._size > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.len = len(self._head) + self._size + len(self._tail)
+        self._pos = 0
+
+    def __len__(self):
+        return self.len
+
+    def __iter__(self):
+        # Starts at the current position, so a request retried after ``seek(0)`` resends the whole body.
+        while True:
+            chunk = self._read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _read(self, size=-1):
+        if size is None or size < 0:
+            size = self.len - self._pos
+
+        parts = []
+        while size > 0 and self._pos < self.len:
+            chunk = self._read_at(self._pos, size)
+            if not chunk:
+                break
+            parts.append(chunk)
+            self._pos += len(chunk)
+            size -= len(chunk)
+
+        data = b"".join(parts)
+        if data and self.progress_fn:
+            self.progress_fn(self._pos, self.len)
+        return data
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self.len
+        self._pos = max(0, min(offset, self.len))
+        return self._pos
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def _read_at(self, pos, size):
+        head_len = len(self._head)
+        if pos < head_len:
+            return self._head[pos:pos + size]
+
+        pos -= head_len
+        if pos < self._size:
+            size = min(size, self._size - pos, self.chunk_size)
+            if self._mmap is not None:
+                return self._mmap[pos:pos + size]
+            self._file.seek(pos)
+            return self._file.read(size)
+
+        pos -= self._size
+        return self._tail[pos:pos + size]
+
+    @staticmethod
+    def _quote(value):
+        return value.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
@@ -0,0 +1,53 @@
+import random
+import threading
+
+
+class PollScheduler:
+    """
+    Adaptive delays between pretranslation status polls.
+
+    Polls start fast and back off exponentially with jitter. Once some documents have completed,
+    the scheduler learns how long pretranslation takes per byte of source and sleeps until a
+    document is expected to be ready instead of polling it repeatedly.
+    A single scheduler can be shared between jobs so that it keeps what it has learned.
+    """
+
+    def __init__(self, initial_delay=1.0, max_delay=30.0, backoff=1.5, jitter=0.2, smoothing=0.3):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.jitter = jitter
+        self.smoothing = smoothing
+        self._seconds_per_byte = None
+        self._lock = threading.Lock()
+
+    def next_delay(self, attempt, elapsed=0.0, size=None):
+        """Returns the delay before poll number ``attempt`` (0-based) of a document.
+
+        :param elapsed: Seconds since the document was uploaded.
+        :param size: Source size in bytes, if known.
+        """
+        delay = self.initial_delay * self.backoff ** attempt
+        expected = self.expected_duration(size)
+        if expected is not None and elapsed < expected:
+            delay = max(self.initial_delay, expected - elapsed)
+        delay = min(delay, self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def expected_duration(self, size):
+        """Returns the learned pretranslation time for ``size`` bytes, or ``None`` before any completion."""
+        with self._lock:
+            if size is None or self._seconds_per_byte is None:
+                return None
+            return size * self._seconds_per_byte
+
+    def record_completion(self, duration, size):
+        """Feeds an observed pretranslation time back into the estimate."""
+        if not size:
+            return
+        with self._lock:
+            rate = duration / size
+            if self._seconds_per_byte is None:
+                self._seconds_per_byte = rate
+            else:
+                self._seconds_per_byte += self.smoothing * (rate - self._seconds_per_byte)
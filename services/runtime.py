@@ -0,0 +1,62 @@
+"""Shared objects built from the ``.env`` configuration, used by both the GUI and the command line."""
+
+from api import SmartCAT, RetryPolicy, RateLimiter
+from services.file_pipeline import STATISTICS_CONCURRENCY
+from services.metrics import REGISTRY, MetricsServer, TextfileWriter
+
+
+def create_api_client(config):
+    """Creates a SmartCAT client with the configured transport, retries, throttling and metrics.
+
+    The connection pool is grown to the number of requests the configured workers can have
+    in flight, so that no connection is discarded and reopened with a new TLS handshake.
+    """
+    return SmartCAT(
+        config["username"],
+        config["password"],
+        config["server_url"],
+        pool_size=max(config["http_pool_size"], concurrent_requests(config)),
+        timeout=(config["http_connect_timeout"], config["http_read_timeout"]),
+        keep_alive=config["http_keep_alive"],
+        retry_policy=RetryPolicy(
+            max_retries=config["http_max_retries"],
+            backoff_base=config["http_backoff_base"],
+            backoff_max=config["http_backoff_max"],
+            retry_after_max=config["http_retry_after_max"],
+        ),
+        rate_limiter=create_rate_limiter(config),
+        metrics=REGISTRY,
+    )
+
+
+def concurrent_requests(config):
+    """Returns how many API requests a file job and a text translation can have in flight at once."""
+    return (
+        config["files_upload_concurrency"]
+        + config["files_export_concurrency"]
+        + config["status_poll_concurrency"]
+        + STATISTICS_CONCURRENCY
+        + config["text_chunk_concurrency"]
+    )
+
+
+def create_rate_limiter(config):
+    """Creates the request throttle shared by everything using one client, or None if disabled."""
+    rate = config["http_rate_limit"]
+    if rate <= 0:
+        return None
+    poll_rate = config["http_poll_rate_limit"]
+    endpoint_rates = {"document.get": poll_rate} if poll_rate > 0 else None
+    return RateLimiter(rate=rate, burst=config["http_rate_burst"], endpoint_rates=endpoint_rates)
+
+
+def start_metrics_exporters(config):
+    """Publishes job metrics over HTTP and/or to a textfile, as configured, and returns the exporters."""
+    exporters = []
+    if config["metrics_port"] > 0:
+        exporters.append(MetricsServer(REGISTRY, config["metrics_port"], config["metrics_host"]))
+    if config["metrics_textfile"]:
+        exporters.append(TextfileWriter(config["metrics_textfile"], REGISTRY, config["metrics_textfile_interval"]))
+    for exporter in exporters:
+        exporter.start()
+    return exporters
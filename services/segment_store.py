@@ -0,0 +1,83 @@
+import re
+import json
+import time
+import hashlib
+from services.sqlite_store import SQLiteStore
+
+# Paragraph breaks, line breaks and the whitespace after sentence-ending punctuation.
+_SEGMENT_SEPARATOR = re.compile(r"(\n\s*\n|\n|(?<=[.!?…])[ \t]+)")
+
+
+def split_segments(text):
+    """Splits text into ``(segments, separators)`` so that the original layout can be restored.
+
+    ``segments`` has exactly one more item than ``separators``;
+    see :func:`join_segments`.
+    """
+    parts = _SEGMENT_SEPARATOR.split(text)
+    return parts[0::2], parts[1::2]
+
+
+def join_segments(segments, separators):
+    pieces = [segments[0]]
+    for separator, segment in zip(separators, segments[1:]):
+        pieces.append(separator)
+        pieces.append(segment)
+    return "".join(pieces)
+
+
+class SegmentStore(SQLiteStore):
+    """
+    Local translation memory of individual sentences, backed by SQLite.
+
+    Segments are keyed by a hash of the segment text, language pair and project,
+    and the least recently used ones are evicted beyond ``max_entries``.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS segments ("
+        "key TEXT PRIMARY KEY, translation TEXT NOT NULL, accessed_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS segments_accessed ON segments (accessed_at)",
+    )
+
+    def __init__(self, path, max_entries=100000):
+        self.max_entries = max_entries
+        super().__init__(path)
+
+    @staticmethod
+    def make_key(segment, source_lang, target_lang, project_id):
+        payload = json.dumps([segment, source_lang, target_lang, project_id], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        """Returns ``{key: translation}`` for the keys found in the store."""
+        keys = list(set(keys))
+        found = {}
+        now = time.time()
+        with self._connect() as conn:
+            # Stay below SQLite's bound parameter limit.
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, translation FROM segments WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(rows)
+                conn.execute(
+                    f"UPDATE segments SET accessed_at = ? WHERE key IN ({placeholders})", [now, *chunk]
+                )
+        return found
+
+    def put_many(self, translations):
+        """Stores ``{key: translation}`` and evicts the least recently used segments."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO segments (key, translation, accessed_at) VALUES (?, ?, ?)",
+                [(key, translation, now) for key, translation in translations.items()],
+            )
+            conn.execute(
+                "DELETE FROM segments WHERE key IN ("
+                "SELECT key FROM segments ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
@@ -0,0 +1,30 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+
+class SQLiteStore:
+    """
+    Base class for the small SQLite-backed local stores.
+
+    Subclasses list their ``CREATE`` statements in ``SCHEMA``; every operation opens
+    a short-lived connection, which keeps the stores safe to use from worker threads.
+    """
+
+    SCHEMA = ()
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
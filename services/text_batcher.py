@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import Future
+
+
+class TextBatcher:
+    """
+    Collects text translation requests that arrive within ``window`` seconds of each other
+    and translates them together as one multi-key JSON document.
+
+    :meth:`translate` blocks the calling thread until its own result is available,
+    so callers keep a simple one-request-one-result API while the per-document API
+    overhead (upload, polling, export, download, delete) is shared by the whole batch.
+    """
+
+    def __init__(self, service, window=0.5, max_batch_size=50, log_fn=None):
+        self.service = service
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.log_fn = log_fn or (lambda message: None)
+        self._pending = []
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def translate(self, text):
+        return self.submit(text).result()
+
+    def submit(self, text):
+        """Queues ``text`` and returns a :class:`~concurrent.futures.Future` for its translation."""
+        future = Future()
+        with self._lock:
+            self._pending.append((text, future))
+            if len(self._pending) >= self.max_batch_size:
+                self._cancel_timer()
+                batch, self._pending = self._pending, []
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if batch:
+            threading.Thread(target=self._translate_batch, args=(batch,), daemon=True).start()
+        return future
+
+    def flush(self):
+        """Translates everything queued so far in the calling thread."""
+        with self._lock:
+            self._cancel_timer()
+            batch, self._pending = self._pending, []
+        if batch:
+            self._translate_batch(batch)
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _translate_batch(self, batch):
+        texts = {f"t{i}": text for i, (text, _) in enumerate(batch)}
+        try:
+            self.log_fn(f"Translating {len(batch)} queued texts in one document...")
+            translated = self.service.translate_texts(texts, self.log_fn)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for i, (text, future) in enumerate(batch):
+            key = f"t{i}"
+            if key in translated:
+                future.set_result(translated[key])
+            else:
+                future.set_exception(Exception("Translation missing from batch result"))
@@ -0,0 +1,25 @@
+import re
+
+_PARAGRAPH_SEPARATOR = re.compile(r"(\n\s*\n)")
+
+
+def split_chunks(text, max_words):
+    """Groups paragraphs into chunks of at most ``max_words`` words.
+
+    Returns ``(chunks, separators)`` in the same shape as :func:`~services.segment_store.split_segments`.
+    """
+    parts = _PARAGRAPH_SEPARATOR.split(text)
+    paragraphs, breaks = parts[0::2], parts[1::2]
+
+    chunks, separators = [paragraphs[0]], []
+    words = len(paragraphs[0].split())
+    for separator, paragraph in zip(breaks, paragraphs[1:]):
+        paragraph_words = len(paragraph.split())
+        if words + paragraph_words > max_words:
+            chunks.append(paragraph)
+            separators.append(separator)
+            words = paragraph_words
+        else:
+            chunks[-1] += separator + paragraph
+            words += paragraph_words
+    return chunks, separators
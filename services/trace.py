@@ -0,0 +1,70 @@
+import os
+import json
+import time
+import threading
+
+
+class DocumentTrace:
+    """
+    Wall-clock timestamps of the stages one document went through.
+
+    Only the first occurrence of a stage is kept, so repeated status polls
+    leave ``first_poll`` at the first one.
+    """
+
+    STAGES = (
+        "upload_started",
+        "uploaded",
+        "first_poll",
+        "pretranslated",
+        "export_requested",
+        "export_ready",
+        "downloaded",
+        "deleted",
+    )
+
+    def __init__(self, document_id, file_name=None, size=None):
+        self.document_id = document_id
+        self.file_name = file_name
+        self.size = size
+        self.stages = {}
+        self.error = None
+
+    def mark(self, stage, at=None):
+        self.stages.setdefault(stage, time.time() if at is None else at)
+
+    def to_dict(self):
+        """Returns the trace with per-stage durations, in seconds since the previous recorded stage."""
+        stages = {stage: self.stages[stage] for stage in self.STAGES if stage in self.stages}
+        durations, previous = {}, None
+        for stage, at in stages.items():
+            if previous is not None:
+                durations[stage] = round(at - previous, 3)
+            previous = at
+        times = list(stages.values())
+        return {
+            "document_id": self.document_id,
+            "file": self.file_name,
+            "extension": os.path.splitext(self.file_name or "")[1].lower() or None,
+            "size": self.size,
+            "stages": stages,
+            "durations": durations,
+            "total": round(times[-1] - times[0], 3) if times else 0.0,
+            "error": self.error,
+        }
+
+
+class TraceWriter:
+    """Appends finished document traces to a JSON Lines file."""
+
+    # Writers of the same file from different tabs must not interleave their lines.
+    _lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def write(self, trace):
+        line = json.dumps(trace, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
@@ -0,0 +1,65 @@
+import json
+import time
+import hashlib
+from services.sqlite_store import SQLiteStore
+
+
+class TranslationCache(SQLiteStore):
+    """
+    Persistent text translation cache backed by SQLite.
+
+    Entries are keyed by a hash of the source text, language pair and project,
+    expire after ``ttl`` seconds and are evicted least-recently-used first
+    once the cache holds more than ``max_entries`` translations.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS translations ("
+        "key TEXT PRIMARY KEY, translation TEXT NOT NULL, "
+        "created_at REAL NOT NULL, accessed_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS translations_accessed ON translations (accessed_at)",
+    )
+
+    def __init__(self, path, max_entries=1000, ttl=7 * 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        super().__init__(path)
+
+    @staticmethod
+    def make_key(text, source_lang, target_lang, project_id):
+        payload = json.dumps([text, source_lang, target_lang, project_id], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Returns the cached translation, or ``None`` if it is missing or expired."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT translation, created_at FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            translation, created_at = row
+            if now - created_at > self.ttl:
+                conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE translations SET accessed_at = ? WHERE key = ?", (now, key))
+            return translation
+
+    def put(self, key, translation):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO translations (key, translation, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, translation, now, now),
+            )
+            conn.execute("DELETE FROM translations WHERE created_at < ?", (now - self.ttl,))
+            conn.execute(
+                "DELETE FROM translations WHERE key IN ("
+                "SELECT key FROM translations ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM translations")
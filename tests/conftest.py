@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The project is not an installable package, so tests import ``api`` and ``services`` from the checkout itself.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+import cli
+from config import load_env_config
+
+
+@pytest.fixture
+def sources(tmp_path):
+    for name in ("docs/a.txt", "docs/b.txt", "docs/sub/a.txt", "docs/sub/c.txt",
+                 "docs/.hidden.txt", "docs/b_translated.txt"):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+    return tmp_path / "docs"
+
+
+def _names(paths, root):
+    return [os.path.relpath(path, root) for path in paths]
+
+
+def test_collect_files(sources):
+    assert _names(cli.collect_files([str(sources)]), sources) == ["a.txt", "b.txt"]
+    assert _names(cli.collect_files([str(sources)], recursive=True), sources) == [
+        "a.txt", "b.txt", os.path.join("sub", "a.txt"), os.path.join("sub", "c.txt"),
+    ]
+    assert _names(cli.collect_files([str(sources)], "c*", recursive=True), sources) == [os.path.join("sub", "c.txt")]
+
+
+def test_output_collisions(sources, tmp_path):
+    paths = cli.collect_files([str(sources)], recursive=True)
+    out = str(tmp_path / "out")
+
+    assert cli.output_collisions(paths, None) == {}
+    collisions = cli.output_collisions(paths, out)
+    assert list(collisions.values()) == [[str(sources / "a.txt"), str(sources / "sub" / "a.txt")]]
+
+
+def test_translate_refuses_colliding_outputs(sources, tmp_path, monkeypatch):
+    config = dict(load_env_config(), username="user", password="secret", project_id="p1")
+    monkeypatch.setattr(cli, "load_env_config", lambda: config)
+    monkeypatch.setattr(cli, "create_api_client", pytest.fail)
+    out = tmp_path / "out"
+
+    assert cli.main(["translate", str(sources), "-r", "--out", str(out)]) == cli.EXIT_USAGE
+    assert not out.exists()
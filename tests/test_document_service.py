@@ -0,0 +1,73 @@
+import zipfile
+
+import pytest
+
+from services.document_service import DocumentService
+from services.segment_store import SegmentStore
+
+
+def _entries(*names):
+    return [zipfile.ZipInfo(name) for name in names]
+
+
+@pytest.mark.parametrize("names, filename, expected", [
+    (["report.docx"], "report.docx", "report.docx"),
+    (["out/report.docx"], "report.docx", "out/report.docx"),
+    (["report_en.docx"], "report.docx", "report_en.docx"),
+    (["report_en-US.docx"], "report.docx", "report_en-US.docx"),
+    (["report (de).docx"], "report.docx", "report (de).docx"),
+    (["report_en.docx", "report.docx"], "report.docx", "report.docx"),
+    (["report_en.docx", "report_de.docx"], "report.docx", None),
+    (["report_final_en.docx"], "report.docx", None),
+    (["report_en.txt"], "report.docx", None),
+    (["report.v2_en.docx"], "report.docx", None),
+])
+def test_match_archive_entry(names, filename, expected):
+    entry = DocumentService._match_archive_entry(_entries(*names), filename)
+    assert (entry.filename if entry is not None else None) == expected
+
+
+class StubService(DocumentService):
+    """Translates by upper-casing; keys listed in ``drop`` are left out of the result."""
+
+    def __init__(self, drop=()):
+        super().__init__(None, "p1", max_retries=1, retry_delay=0, source_lang="en", target_lang="de")
+        self.drop = set(drop)
+        self.sent = []
+
+    def translate_texts(self, texts, log_fn):
+        self.sent.append(dict(texts))
+        return {key: text.upper() for key, text in texts.items() if key not in self.drop}
+
+
+def test_segmented_translation_sends_only_unknown_segments(tmp_path):
+    store = SegmentStore(str(tmp_path / "segments.db"))
+    service = StubService()
+    service.translate_segmented("Hello. World.", store, print)
+
+    translation = service.translate_segmented("World.  Hello.\n\nNew one.", store, print)
+
+    assert translation == "WORLD.  HELLO.\n\nNEW ONE."
+    assert service.sent[-1] == {"s0": "New one."}
+
+
+def test_segmented_translation_fails_on_missing_segment(tmp_path):
+    store = SegmentStore(str(tmp_path / "segments.db"))
+
+    with pytest.raises(Exception, match="Translation missing"):
+        StubService(drop=["s1"]).translate_segmented("Hello. World.", store, print)
+
+    assert StubService().translate_segmented("Hello. World.", store, print) == "HELLO. WORLD."
+
+
+def test_large_text_is_reassembled_in_order():
+    service = StubService()
+    text = "\n\n".join(f"paragraph {i}" for i in range(10))
+
+    assert service.translate_large_text(text, 4, 3, print) == text.upper()
+    assert len(service.sent) == 5
+
+
+def test_large_text_fails_on_missing_chunk():
+    with pytest.raises(Exception, match="Translation missing"):
+        StubService(drop=["data"]).translate_large_text("one\n\ntwo", 1, 2, print)
@@ -0,0 +1,36 @@
+import os
+
+from services.file_cache import FileCache
+
+
+def _source(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_put_and_get(tmp_path):
+    cache = FileCache(str(tmp_path / "cache"))
+    key = FileCache.make_key("digest", "en", "de", "p1")
+
+    assert cache.get(key) is None
+    cache.put(key, _source(tmp_path, "a.txt", b"translated"))
+
+    with open(cache.get(key), "rb") as f:
+        assert f.read() == b"translated"
+
+
+def test_least_recently_used_files_are_evicted_beyond_quota(tmp_path):
+    cache = FileCache(str(tmp_path / "cache"), max_bytes=25)
+    cache.put("aa1", _source(tmp_path, "a.txt", b"a" * 10))
+    cache.put("bb2", _source(tmp_path, "b.txt", b"b" * 10))
+    # Make the order of use explicit instead of relying on timestamp resolution.
+    os.utime(cache._entry_path("aa1"), (1000, 1000))
+    os.utime(cache._entry_path("bb2"), (2000, 2000))
+    assert cache.get("aa1") is not None
+
+    cache.put("cc3", _source(tmp_path, "c.txt", b"c" * 10))
+
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") is not None
+    assert cache.get("cc3") is not None
@@ -0,0 +1,203 @@
+import io
+import json
+import os
+import threading
+import zipfile
+
+import pytest
+
+from services.file_pipeline import FilePipeline
+from services.job_journal import JobJournal
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, content=b""):
+        self.status_code = status_code
+        self.payload = payload
+        self.content = content
+        self.text = json.dumps(payload) if payload is not None else content.decode("utf-8", "replace")
+
+    def json(self):
+        return self.payload
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class FakeClient:
+    """In-memory SmartCAT: every document is pretranslated at once, except the files named in ``stuck``.
+
+    The translation of a file is its name prefixed with ``translated:``. A multi-document export
+    is a zip archive whose entries carry the ``archive_suffix`` of the target language.
+    """
+
+    def __init__(self, stuck=(), archive_suffix="_en", drop_from_archive=()):
+        self.stuck = set(stuck)
+        self.archive_suffix = archive_suffix
+        self.drop_from_archive = set(drop_from_archive)
+        self.names = {}
+        self.exports = {}
+        self.export_requests = []
+        self.uploads = []
+        self.deleted = []
+        self._lock = threading.Lock()
+        self.project = self.document = self
+
+    def attach_document(self, project_id, files=None, data=None, headers=None):
+        b"".join(data)
+        with self._lock:
+            doc_id = f"doc{len(self.names) + 1}_1"
+            self.names[doc_id] = data.filename
+            self.uploads.append(data.filename)
+        return FakeResponse(200, [{"id": doc_id}])
+
+    def get(self, doc_id):
+        return FakeResponse(200, {"pretranslateCompleted": self.names[doc_id] not in self.stuck})
+
+    def request_export(self, doc_ids, target_type="target"):
+        with self._lock:
+            task_id = f"task{len(self.exports) + 1}"
+            self.exports[task_id] = list(doc_ids)
+            self.export_requests.append([self.names[doc_id] for doc_id in doc_ids])
+        return FakeResponse(200, {"id": task_id})
+
+    def download_export_result(self, task_id):
+        doc_ids = self.exports[task_id]
+        if len(doc_ids) == 1:
+            return FakeResponse(200, content=self._translation(doc_ids[0]))
+
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            for doc_id in doc_ids:
+                stem, ext = os.path.splitext(self.names[doc_id])
+                if self.names[doc_id] not in self.drop_from_archive:
+                    zf.writestr(f"{stem}{self.archive_suffix}{ext}", self._translation(doc_id))
+        return FakeResponse(200, content=archive.getvalue())
+
+    def delete(self, doc_ids):
+        self.deleted.extend(doc_ids)
+        return FakeResponse(204)
+
+    def segment_confirmation_statistics(self, project_id, document=""):
+        return FakeResponse(200, [])
+
+    def _translation(self, doc_id):
+        return f"translated:{self.names[doc_id]}".encode("utf-8")
+
+
+def _write_files(tmp_path, *names):
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_text(f"source of {name}")
+        paths.append(str(path))
+    return paths
+
+
+def _pipeline(client, paths, **kwargs):
+    # retry_delay=0 makes the pretranslation timeout expire after the first status poll.
+    return FilePipeline(client, paths, "p1", retry_delay=0, **kwargs)
+
+
+@pytest.mark.parametrize("pipelined", [True, False])
+def test_documents_that_time_out_are_not_exported(tmp_path, pipelined):
+    ready, stuck = _write_files(tmp_path, "ready.txt", "stuck.txt")
+    client = FakeClient(stuck=["stuck.txt"])
+    pipeline = _pipeline(client, [ready, stuck], pipelined=pipelined)
+
+    pipeline.run()
+
+    assert client.export_requests == [["ready.txt"]]
+    assert pipeline.translated == [ready]
+    assert pipeline.failed == [(stuck, "Translation did not complete in time")]
+    assert (tmp_path / "ready_translated.txt").read_text() == "translated:ready.txt"
+    assert not (tmp_path / "stuck_translated.txt").exists()
+
+
+def test_batch_export_unpacks_archive_into_outputs(tmp_path):
+    paths = _write_files(tmp_path, "a.txt", "b.txt", "c.txt", "d.txt", "e.txt")
+    client = FakeClient(drop_from_archive=["b.txt"])
+    pipeline = _pipeline(client, paths, upload_concurrency=1, export_batch_size=2)
+
+    pipeline.run()
+
+    assert client.export_requests == [["a.txt", "b.txt"], ["c.txt", "d.txt"], ["e.txt"]]
+    for name in ("a", "c", "d", "e"):
+        assert (tmp_path / f"{name}_translated.txt").read_text() == f"translated:{name}.txt"
+    assert pipeline.failed == [(paths[1], "Missing from export archive")]
+    assert len(client.deleted) == 4
+
+
+def test_export_batches_keep_file_names_unique(tmp_path):
+    (tmp_path / "x").mkdir()
+    (tmp_path / "y").mkdir()
+    pipeline = _pipeline(FakeClient(), [], export_batch_size=3)
+
+    batches = pipeline._export_batches({
+        "d1": str(tmp_path / "x" / "a.txt"),
+        "d2": str(tmp_path / "y" / "a.txt"),
+        "d3": str(tmp_path / "x" / "b.txt"),
+        "d4": str(tmp_path / "x" / "c.txt"),
+    })
+
+    assert [list(batch) for batch in batches] == [["d1", "d3", "d4"], ["d2"]]
+
+
+def test_resume_does_not_upload_again(tmp_path):
+    done, stuck = _write_files(tmp_path, "done.txt", "stuck.txt")
+    journal = JobJournal(str(tmp_path / "journal.db"))
+    client = FakeClient(stuck=["stuck.txt"])
+
+    first = _pipeline(client, [done, stuck], journal=journal)
+    first.run()
+    assert first.failed == [(stuck, "Translation did not complete in time")]
+    records = journal.load(first.job_id)
+    assert records[done]["stage"] == JobJournal.DELETED
+    assert records[stuck]["stage"] == JobJournal.UPLOADED
+
+    client.stuck.clear()
+    second = _pipeline(client, [done, stuck], journal=journal)
+    second.run()
+
+    assert sorted(client.uploads) == ["done.txt", "stuck.txt"]
+    assert client.export_requests[-1] == ["stuck.txt"]
+    assert sorted(second.translated) == [done, stuck]
+    assert second.failed == []
+    assert journal.load(second.job_id) == {}
+
+
+def test_resume_uploads_files_that_changed(tmp_path):
+    path, = _write_files(tmp_path, "doc.txt")
+    journal = JobJournal(str(tmp_path / "journal.db"))
+    client = FakeClient(stuck=["doc.txt"])
+    _pipeline(client, [path], journal=journal).run()
+
+    (tmp_path / "doc.txt").write_text("edited")
+    client.stuck.clear()
+    pipeline = _pipeline(client, [path], journal=journal)
+    pipeline.run()
+
+    assert client.uploads == ["doc.txt", "doc.txt"]
+    assert pipeline.translated == [path]
+
+
+def test_uploads_are_journaled_when_the_job_is_interrupted(tmp_path):
+    paths = _write_files(tmp_path, "a.txt", "b.txt", "c.txt", "d.txt")
+    journal = JobJournal(str(tmp_path / "journal.db"))
+    client = FakeClient()
+
+    def progress(message):
+        if message.startswith("Uploaded "):
+            raise KeyboardInterrupt
+
+    pipeline = _pipeline(client, paths, journal=journal, upload_concurrency=1, progress_fn=progress)
+    with pytest.raises(KeyboardInterrupt):
+        pipeline.run()
+
+    records = journal.load(pipeline.job_id)
+    assert {record["doc_id"] for record in records.values()} == set(client.names)
+    assert len(client.uploads) < len(paths)
@@ -0,0 +1,32 @@
+import os
+import stat
+
+import services.atomic_write
+from services.metrics import MetricsRegistry, TextfileWriter
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_textfile_is_readable_by_the_collector(tmp_path, monkeypatch):
+    monkeypatch.setattr(services.atomic_write, "_UMASK", 0o022)
+    registry = MetricsRegistry()
+    registry.inc("smartcat_documents_uploaded_total", 3)
+    path = tmp_path / "smartcat.prom"
+
+    TextfileWriter(str(path), registry).write()
+
+    assert "smartcat_documents_uploaded_total 3" in path.read_text()
+    assert _mode(path) == 0o644
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_textfile_keeps_the_mode_of_the_file_it_replaces(tmp_path):
+    path = tmp_path / "smartcat.prom"
+    path.write_text("")
+    os.chmod(path, 0o640)
+
+    TextfileWriter(str(path), MetricsRegistry()).write()
+
+    assert _mode(path) == 0o640
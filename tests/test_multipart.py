@@ -0,0 +1,74 @@
+import pytest
+from urllib3 import encode_multipart_formdata
+
+from services.multipart import MultipartFileStream
+
+CONTENT = bytes(range(256)) * 40 + b"\r\n--not-a-boundary--\r\n"
+
+
+def _expected(stream, filename, content, content_type):
+    body, header = encode_multipart_formdata({"file": (filename, content, content_type)}, boundary=stream.boundary)
+    assert header == stream.content_type
+    return body
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096, 1024 * 1024])
+def test_body_matches_urllib3_encoding(tmp_path, use_mmap, chunk_size):
+    path = tmp_path / "report.docx"
+    path.write_bytes(CONTENT)
+
+    with MultipartFileStream("file", str(path), "application/octet-stream", chunk_size, use_mmap) as stream:
+        chunks = list(stream)
+
+    expected = _expected(stream, "report.docx", CONTENT, "application/octet-stream")
+    assert b"".join(chunks) == expected
+    assert len(stream) == len(expected)
+    assert all(0 < len(chunk) <= chunk_size for chunk in chunks)
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_empty_file(tmp_path, use_mmap):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+
+    with MultipartFileStream("file", str(path), "text/plain", use_mmap=use_mmap) as stream:
+        assert b"".join(stream) == _expected(stream, "empty.txt", b"", "text/plain")
+
+
+def test_filename_is_quoted(tmp_path):
+    path = tmp_path / 'say "hi".txt'
+    path.write_bytes(b"hi")
+
+    with MultipartFileStream("file", str(path), "text/plain") as stream:
+        assert b"".join(stream) == _expected(stream, 'say "hi".txt', b"hi", "text/plain")
+        assert b'filename="say %22hi%22.txt"' in stream._head
+
+
+def test_seek_replays_body(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(CONTENT)
+
+    with MultipartFileStream("file", str(path), chunk_size=1000) as stream:
+        first = b"".join(stream)
+        assert stream.tell() == len(stream)
+        assert b"".join(stream) == b""
+
+        stream.seek(0)
+        assert b"".join(stream) == first
+
+        stream.seek(-10, 2)
+        assert b"".join(stream) == first[-10:]
+
+
+def test_progress_reported_once_per_chunk(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(CONTENT)
+    calls = []
+
+    with MultipartFileStream("file", str(path), chunk_size=4096, progress_fn=lambda *args: calls.append(args)) as stream:
+        chunks = list(stream)
+
+    assert len(calls) == len(chunks)
+    assert [sent for sent, _ in calls] == sorted({sent for sent, _ in calls})
+    assert calls[-1] == (len(stream), len(stream))
@@ -0,0 +1,72 @@
+import pytest
+
+import api
+from api import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freezes ``time.monotonic``; ``time.sleep`` advances it and records the delay.
+
+    Tests use rates whose waits are exact binary fractions, so refills are not a rounding error short.
+    """
+    state = {"now": 1000.0, "sleeps": []}
+
+    def sleep(seconds):
+        state["sleeps"].append(seconds)
+        state["now"] += seconds
+
+    monkeypatch.setattr(api.time, "monotonic", lambda: state["now"])
+    monkeypatch.setattr(api.time, "sleep", sleep)
+    return state
+
+
+def test_rate_limiter_waits_for_refill(clock):
+    limiter = RateLimiter(rate=8, burst=2, low_priority=())
+
+    limiter.acquire("project.attach_document")
+    limiter.acquire("project.attach_document")
+    assert clock["sleeps"] == []
+
+    limiter.acquire("project.attach_document")
+    assert clock["sleeps"] == [0.125]
+
+
+def test_rate_limiter_endpoint_budget(clock):
+    limiter = RateLimiter(rate=100, burst=100, endpoint_rates={"document.get": 2}, low_priority=())
+
+    for _ in range(2):
+        limiter.acquire("document.get")
+    limiter.acquire("document.export")
+    assert clock["sleeps"] == []
+
+    limiter.acquire("document.get")
+    assert clock["sleeps"] == [0.5]
+
+
+def test_rate_limiter_keeps_reserve_from_low_priority(clock):
+    limiter = RateLimiter(rate=8, burst=4, reserve=0.5)
+
+    # Status polls stop at the reserved half of the bucket...
+    for _ in range(3):
+        limiter.acquire("document.get")
+    assert clock["sleeps"] == [0.125]
+
+    # ...which uploads can still spend without waiting.
+    for _ in range(2):
+        limiter.acquire("project.attach_document")
+    assert clock["sleeps"] == [0.125]
+
+    limiter.acquire("document.get")
+    assert clock["sleeps"] == [0.125, 0.375]
+
+
+@pytest.mark.parametrize("burst, reserve", [(1, 0.25), (2, 1.0), (4, 2.0)])
+def test_reserve_never_exceeds_what_the_bucket_can_hold(clock, burst, reserve):
+    limiter = RateLimiter(rate=8, burst=burst, reserve=reserve)
+
+    for _ in range(3):
+        limiter.acquire("document.get")
+
+    assert len(clock["sleeps"]) == 2
+    assert all(0 < wait <= 0.125 * burst for wait in clock["sleeps"])
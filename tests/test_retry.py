@@ -0,0 +1,148 @@
+import io
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from api import Project, RetryPolicy
+from services.multipart import MultipartFileStream
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Answers with the given statuses in turn and keeps the body sent with every attempt."""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.bodies = []
+
+    def request(self, method, url, data=None, **kwargs):
+        if data is None or isinstance(data, bytes):
+            self.bodies.append(data)
+        elif hasattr(data, "read"):
+            self.bodies.append(data.read())
+        else:
+            self.bodies.append(b"".join(data))
+        return FakeResponse(self.statuses.pop(0))
+
+
+@pytest.mark.parametrize("idempotent, status, expected", [
+    (True, 200, False),
+    (True, 400, False),
+    (True, 404, False),
+    (True, 429, True),
+    (True, 500, True),
+    (True, 502, True),
+    (True, 503, True),
+    (True, 504, True),
+    (False, 200, False),
+    (False, 400, False),
+    (False, 429, True),
+    (False, 500, False),
+    (False, 502, False),
+    (False, 503, True),
+    (False, 504, False),
+])
+def test_should_retry_status(idempotent, status, expected):
+    policy = RetryPolicy(max_retries=3)
+    assert policy.should_retry(0, idempotent, response=FakeResponse(status)) is expected
+
+
+@pytest.mark.parametrize("idempotent, error, expected", [
+    (True, requests.exceptions.ConnectTimeout(), True),
+    (True, requests.exceptions.ReadTimeout(), True),
+    (True, requests.exceptions.ConnectionError(), True),
+    (True, requests.exceptions.InvalidURL(), False),
+    (False, requests.exceptions.ConnectTimeout(), True),
+    (False, requests.exceptions.ReadTimeout(), False),
+    (False, requests.exceptions.ConnectionError(), False),
+    (False, requests.exceptions.InvalidURL(), False),
+])
+def test_should_retry_error(idempotent, error, expected):
+    policy = RetryPolicy(max_retries=3)
+    assert policy.should_retry(0, idempotent, error=error) is expected
+
+
+def test_should_retry_stops_after_max_retries():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.should_retry(1, True, response=FakeResponse(503))
+    assert not policy.should_retry(2, True, response=FakeResponse(503))
+    assert not policy.should_retry(2, True, error=requests.exceptions.ConnectTimeout())
+
+
+@pytest.mark.parametrize("value, expected", [("7", 7.0), ("0.5", 0.5), ("-3", 0.0)])
+def test_retry_after_seconds(value, expected):
+    policy = RetryPolicy(backoff_base=100, jitter=0)
+    assert policy.delay(0, FakeResponse(503, {"Retry-After": value})) == expected
+
+
+def test_retry_after_http_date():
+    policy = RetryPolicy(backoff_base=100, jitter=0)
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 28 <= policy.delay(0, FakeResponse(503, {"Retry-After": later})) <= 30
+
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert policy.delay(0, FakeResponse(503, {"Retry-After": earlier})) == 0.0
+
+
+@pytest.mark.parametrize("retry_after_max, expected", [(120.0, 120.0), (5, 5)])
+def test_retry_after_is_capped(retry_after_max, expected):
+    policy = RetryPolicy(retry_after_max=retry_after_max)
+    assert policy.delay(0, FakeResponse(429, {"Retry-After": "86400"})) == expected
+
+    tomorrow = format_datetime(datetime.now(timezone.utc) + timedelta(days=1), usegmt=True)
+    assert policy.delay(0, FakeResponse(429, {"Retry-After": tomorrow})) == expected
+
+
+def test_invalid_retry_after_falls_back_to_backoff():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=30, jitter=0)
+    assert policy.delay(2, FakeResponse(503, {"Retry-After": "soon"})) == 2.0
+    assert policy.delay(10, FakeResponse(503)) == 30
+
+
+def _project(session, max_retries=2):
+    return Project(session, "https://smartcat.test", retry_policy=RetryPolicy(max_retries, backoff_base=0, jitter=0))
+
+
+def test_retry_rewinds_file_body():
+    session = FakeSession(503, 503, 200)
+    body = io.BytesIO(b"prefix:payload")
+    body.seek(len(b"prefix:"))
+
+    response = _project(session).attach_document("p1", data=body)
+
+    assert response.status_code == 200
+    assert session.bodies == [b"payload"] * 3
+
+
+def test_retry_rewinds_multipart_stream(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"x" * 100)
+    session = FakeSession(429, 200)
+
+    with MultipartFileStream("file", str(path), chunk_size=16) as stream:
+        response = _project(session).attach_document("p1", data=stream)
+        stream.seek(0)
+        expected = b"".join(stream)
+
+    assert response.status_code == 200
+    assert len(session.bodies) == 2
+    assert session.bodies[0] == session.bodies[1] == expected
+    assert len(expected) == len(stream)
+
+
+def test_body_that_cannot_be_rewound_is_sent_once():
+    session = FakeSession(503, 200)
+    response = _project(session).attach_document("p1", data=iter([b"a", b"b"]))
+
+    assert response.status_code == 503
+    assert session.bodies == [b"ab"]
@@ -0,0 +1,38 @@
+import pytest
+
+import services.segment_store
+from services.segment_store import SegmentStore, join_segments, split_segments
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "One sentence",
+    "First. Second! Third? Fourth…  Fifth.",
+    "Line one\nLine two\n\n  Indented paragraph.\tTabbed.",
+    "Trailing separators.\n\n",
+    "Version 1.2 stays whole. e.g.this too",
+])
+def test_split_segments_round_trip(text):
+    segments, separators = split_segments(text)
+    assert len(segments) == len(separators) + 1
+    assert join_segments(segments, separators) == text
+
+
+def test_split_segments_at_sentences_and_lines():
+    segments, separators = split_segments("Hello there. How are you?\nFine.\n\nBye")
+    assert segments == ["Hello there.", "How are you?", "Fine.", "Bye"]
+    assert separators == [" ", "\n", "\n\n"]
+
+
+def test_least_recently_used_segments_are_evicted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(services.segment_store.time, "time", lambda: now[0])
+    store = SegmentStore(str(tmp_path / "segments.db"), max_entries=2)
+
+    store.put_many({"a": "A", "b": "B"})
+    now[0] += 1
+    assert store.get_many(["a"]) == {"a": "A"}
+    now[0] += 1
+    store.put_many({"c": "C"})
+
+    assert store.get_many(["a", "b", "c"]) == {"a": "A", "c": "C"}
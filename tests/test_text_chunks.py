@@ -0,0 +1,24 @@
+import pytest
+
+from services.segment_store import join_segments
+from services.text_chunks import split_chunks
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "one two three",
+    "one two\n\nthree four\n\nfive six",
+    "one two\n \n\nthree four five six seven\n\n",
+])
+@pytest.mark.parametrize("max_words", [1, 2, 4, 100])
+def test_split_chunks_round_trip(text, max_words):
+    chunks, separators = split_chunks(text, max_words)
+    assert len(chunks) == len(separators) + 1
+    assert join_segments(chunks, separators) == text
+
+
+def test_chunks_group_paragraphs_up_to_the_budget():
+    text = "a b\n\nc d\n\ne f g h i\n\nj"
+    chunks, separators = split_chunks(text, 4)
+    assert chunks == ["a b\n\nc d", "e f g h i", "j"]
+    assert separators == ["\n\n", "\n\n"]
@@ -0,0 +1,44 @@
+import pytest
+
+import services.translation_cache
+from services.translation_cache import TranslationCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    state = {"now": 1000.0}
+    monkeypatch.setattr(services.translation_cache.time, "time", lambda: state["now"])
+    return state
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = TranslationCache(str(tmp_path / "cache.db"), max_entries=2)
+    cache.put("a", "A")
+    clock["now"] += 1
+    cache.put("b", "B")
+    clock["now"] += 1
+    assert cache.get("a") == "A"
+    clock["now"] += 1
+
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_expired_entries_are_not_served(tmp_path, clock):
+    cache = TranslationCache(str(tmp_path / "cache.db"), ttl=60)
+    cache.put("a", "A")
+
+    clock["now"] += 59
+    assert cache.get("a") == "A"
+    clock["now"] += 2
+    assert cache.get("a") is None
+
+
+def test_make_key_depends_on_language_pair_and_project():
+    key = TranslationCache.make_key("Hello", "en", "de", "p1")
+    assert key == TranslationCache.make_key("Hello", "en", "de", "p1")
+    assert key != TranslationCache.make_key("Hello", "en", "fr", "p1")
+    assert key != TranslationCache.make_key("Hello", "en", "de", "p2")
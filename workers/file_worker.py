@@ -1,6 +1,5 @@
 from PyQt5.QtCore import QThread, pyqtSignal
-from services.document_service import DocumentService
-import os
+from services.file_pipeline import FilePipeline
 
 
 class FileTranslationWorker(QThread):
@@ -8,40 +7,29 @@ class FileTranslationWorker(QThread):
     file_completed = pyqtSignal(str, str)
     all_completed = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
+    document_traced = pyqtSignal(dict)
 
-    def __init__(self, api_client, file_paths, project_id, output_folder=None, max_retries=5, retry_delay=60):
+    def __init__(self, api_client, file_paths, project_id, output_folder=None, max_retries=5, retry_delay=60,
+                 upload_concurrency=4, pipelined=True, export_concurrency=4, export_batch_size=1,
+                 upload_chunk_size=1024 * 1024, upload_use_mmap=False, poll_scheduler=None,
+                 status_poll_concurrency=8, source_lang=None, target_lang=None, file_cache=None, journal=None,
+                 delete_batch_size=50, delete_retries=3, trace_writer=None):
         super().__init__()
-        self.service = DocumentService(api_client, project_id, max_retries, retry_delay)
-        self.file_paths = file_paths
-        self.output_folder = output_folder
+        # Signals emitted from the pipeline's pool threads are queued to the GUI thread by Qt.
+        self.pipeline = FilePipeline(
+            api_client, file_paths, project_id, output_folder, max_retries, retry_delay,
+            upload_concurrency, pipelined, export_concurrency, export_batch_size,
+            upload_chunk_size=upload_chunk_size, upload_use_mmap=upload_use_mmap, poll_scheduler=poll_scheduler,
+            status_poll_concurrency=status_poll_concurrency, source_lang=source_lang, target_lang=target_lang,
+            file_cache=file_cache, journal=journal, delete_batch_size=delete_batch_size,
+            delete_retries=delete_retries, trace_writer=trace_writer,
+            progress_fn=self.progress_updated.emit,
+            file_fn=self.file_completed.emit,
+            trace_fn=self.document_traced.emit,
+        )
 
     def run(self):
-        successful, failed = [], []
-
         try:
-            for path in self.file_paths:
-                try:
-                    self.progress_updated.emit(f"Uploading {os.path.basename(path)}...")
-                    document_id = self.service.upload_file_document(path)
-                    self.progress_updated.emit(f"Uploaded with ID {document_id}")
-                    successful.append((path, document_id))
-                except Exception as e:
-                    self.file_completed.emit(path, f"❌ {str(e)}")
-                    failed.append((path, str(e)))
-
-            self.service.wait_for_all([doc_id for _, doc_id in successful], self.progress_updated.emit)
-
-            for path, doc_id in successful:
-                try:
-                    task_id = self.service.request_export(doc_id)
-                    filename, result_path, stats = self.service.download_and_save_file(task_id, path, doc_id, self.output_folder)
-                    self.service.delete_document(doc_id)
-                    self.file_completed.emit(filename, f"✅ Saved to {result_path}{stats}")
-                except Exception as e:
-                    self.file_completed.emit(path, f"❌ {str(e)}")
-                    failed.append((path, str(e)))
-
-            summary = f"✅ {len(successful)} translated, ❌ {len(failed)} failed."
-            self.all_completed.emit(summary)
+            self.all_completed.emit(self.pipeline.run())
         except Exception as e:
             self.error_occurred.emit(str(e))
@@ -1,34 +1,87 @@
 from PyQt5.QtCore import QThread, pyqtSignal
 from services.document_service import DocumentService
+from services.translation_cache import TranslationCache
 
 
 class TranslationWorker(QThread):
     progress_updated = pyqtSignal(str)
     translation_completed = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
+    document_traced = pyqtSignal(dict)
 
-    def __init__(self, api_client, source_text, project_id, source_lang, target_lang, max_retries, retry_delay):
+    def __init__(self, api_client, source_text, project_id, source_lang, target_lang, max_retries, retry_delay,
+                 poll_scheduler=None, translation_cache=None, segment_store=None,
+                 chunk_words=0, chunk_concurrency=4, trace_writer=None):
         super().__init__()
-        self.service = DocumentService(api_client, project_id, max_retries, retry_delay)
+        self.service = DocumentService(
+            api_client, project_id, max_retries, retry_delay, poll_scheduler=poll_scheduler,
+            source_lang=source_lang, target_lang=target_lang, trace_fn=self._on_trace,
+        )
+        self.trace_writer = trace_writer
         self.source_text = source_text
+        self.translation_cache = translation_cache
+        self.segment_store = segment_store
+        self.chunk_words = chunk_words
+        self.chunk_concurrency = chunk_concurrency
+        self.cache_key = TranslationCache.make_key(source_text, source_lang, target_lang, project_id)
 
     def run(self):
         try:
-            self.progress_updated.emit("Creating and uploading text document...")
-            document_id, temp_path = self.service.upload_text_document(self.source_text)
+            if self.translation_cache is not None:
+                cached = self.translation_cache.get(self.cache_key)
+                self.service.metrics.inc(
+                    "smartcat_cache_requests_total", cache="text", result="miss" if cached is None else "hit"
+                )
+                if cached is not None:
+                    self.progress_updated.emit("Translation served from local cache.")
+                    self.service.metrics.inc("smartcat_texts_processed_total", result="translated")
+                    self.translation_completed.emit(cached)
+                    return
 
-            self.progress_updated.emit("Checking translation status...")
-            self.service.wait_for_translation(document_id, self.progress_updated.emit)
+            document_id = None
+            if self.segment_store is not None:
+                translated_text = self.service.translate_segmented(
+                    self.source_text, self.segment_store, self.progress_updated.emit
+                )
+            elif 0 < self.chunk_words < len(self.source_text.split()):
+                translated_text = self.service.translate_large_text(
+                    self.source_text, self.chunk_words, self.chunk_concurrency, self.progress_updated.emit
+                )
+            else:
+                self.progress_updated.emit("Creating and uploading text document...")
+                document_id = self.service.upload_text_document(self.source_text)
 
-            self.progress_updated.emit("Requesting export...")
-            task_id = self.service.request_export(document_id)
+                self.progress_updated.emit("Checking translation status...")
+                self.service.wait_for_translation(document_id, self.progress_updated.emit)
 
-            self.progress_updated.emit("Downloading translation result...")
-            translated_text = self.service.download_translation(task_id)
+                self.progress_updated.emit("Requesting export...")
+                task_id = self.service.request_export(document_id)
 
+                self.progress_updated.emit("Downloading translation result...")
+                translated_text = self.service.download_translation(task_id)
+
+            if self.translation_cache is not None:
+                self.translation_cache.put(self.cache_key, translated_text)
+
+            self.service.metrics.inc("smartcat_texts_processed_total", result="translated")
             self.translation_completed.emit(translated_text)
 
-            self.service.delete_document(document_id)
-            self.progress_updated.emit("Document deleted.")
+            if document_id is not None:
+                if self.service.delete_document(document_id):
+                    self.progress_updated.emit("Document deleted.")
+                else:
+                    self.progress_updated.emit(f"⚠️ Could not delete document {document_id}")
         except Exception as e:
+            self.service.metrics.inc("smartcat_texts_processed_total", result="failed")
             self.error_occurred.emit(f"Error: {str(e)}")
+        finally:
+            self.service.flush_traces()
+
+    def _on_trace(self, trace):
+        """Publishes the stage trace of a finished document."""
+        if self.trace_writer is not None:
+            try:
+                self.trace_writer.write(trace)
+            except OSError as e:
+                self.progress_updated.emit(f"Could not write trace of {trace['file']}: {str(e)}")
+        self.document_traced.emit(trace)